@@ -1,17 +1,37 @@
 """
-Documetor: A library for creating vector embeddings from documents using Google Vertex AI.
+Documentor: A library for creating vector embeddings from documents using Google Vertex AI.
 
 This package provides tools to extract text from various document formats,
 chunk text intelligently, generate embeddings using Vertex AI,
 and create a searchable vector database.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 
-# Import main classes for convenient access
-from documentor.core.embedder import DocumentEmbedder
-from documentor.processors.base import DocumentProcessor
-from documentor.text.chunker import TextChunker
-from documentor.storage.base import VectorStore
-from documentor.storage.local import LocalVectorStore
-from documentor.storage.vertex import VertexMatchingEngineStore
+# Main classes for convenient access, imported on first use so that
+# `import documentor` (and each CLI invocation) stays cheap
+_LAZY_IMPORTS = {
+    "DocumentEmbedder": "documentor.core.embedder",
+    "DocumentProcessor": "documentor.processors.base",
+    "TextChunker": "documentor.text.chunker",
+    "VectorStore": "documentor.storage.base",
+    "LocalVectorStore": "documentor.storage.local",
+    "VertexMatchingEngineStore": "documentor.storage.vertex",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
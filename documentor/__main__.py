@@ -1,5 +1,5 @@
 """
-Entry point for the documetor CLI.
+Entry point for the documentor CLI.
 """
 
 from documentor.cli import app
@@ -0,0 +1,162 @@
+"""
+Micro-batching of concurrent requests, shared by the embedding and search batchers.
+"""
+
+import time
+import queue
+import threading
+import concurrent.futures
+from typing import Any, List, Sequence, Tuple
+
+# A queued request and the future its caller is waiting on
+Pending = List[Tuple[Any, concurrent.futures.Future]]
+
+
+class MicroBatcher:
+    """
+    Base class for wrappers that coalesce concurrent calls into batches
+
+    Callers on any thread submit a request and block until its result is
+    ready. A background thread collects pending requests until max_batch
+    items are queued or max_wait_ms has passed, then hands each group of the
+    batch to _flush on a pool of max_concurrency threads. Subclasses implement
+    _flush and may override _size and _group.
+    """
+
+    def __init__(
+        self,
+        max_batch: int,
+        max_wait_ms: float,
+        max_concurrency: int = 1,
+        thread_name: str = "micro-batcher"
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            max_batch: Number of items after which a batch is sent immediately
+            max_wait_ms: Maximum time to wait for more requests before sending a batch
+            max_concurrency: Maximum number of batches being processed at once
+            thread_name: Name of the background thread
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrency = max_concurrency
+        self._thread_name = thread_name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = None
+
+    def close(self) -> None:
+        """Flush pending requests and stop the background thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._executor.shutdown(wait=True)
+            self._thread = None
+            self._executor = None
+
+    def _submit(self, request: Any) -> Any:
+        """
+        Queue a request and wait for its result
+
+        Args:
+            request: Request passed to _flush as part of a batch
+
+        Returns:
+            Result set by _flush
+
+        Raises:
+            Exception: Whatever error _flush set for the request
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._ensure_started()
+        self._queue.put((request, future))
+        return future.result()
+
+    def _ensure_started(self) -> None:
+        """Start the background thread on first use"""
+        with self._lock:
+            if self._thread is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency)
+                self._thread = threading.Thread(target=self._run, name=self._thread_name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Collect queued requests into batches until stopped"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            pending = [item]
+            size = self._size(item[0])
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+                size += self._size(item[0])
+
+            for group in self._group(pending):
+                self._executor.submit(self._flush_safely, group)
+
+    def _flush_safely(self, pending: Pending) -> None:
+        """Run _flush, failing every unresolved request if it raises"""
+        try:
+            self._flush(pending)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _size(self, request: Any) -> int:
+        """Number of items a request counts for towards max_batch"""
+        return 1
+
+    def _group(self, pending: Pending) -> List[Pending]:
+        """Split a batch into groups that can be processed together"""
+        return [pending]
+
+    def _flush(self, pending: Pending) -> None:
+        """
+        Process a group of requests and resolve their futures
+
+        Args:
+            pending: List of (request, future) pairs
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _resolve(pending: Pending, results: Sequence[Any]) -> None:
+        """
+        Hand each request its result
+
+        Futures left without a result (when fewer results than requests came
+        back) fail with a RuntimeError instead of blocking their callers forever.
+
+        Args:
+            pending: List of (request, future) pairs
+            results: One result per request, in order
+        """
+        results = list(results)
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
+        if len(results) < len(pending):
+            error = RuntimeError(f"Expected {len(pending)} results, got {len(results)}")
+            for _, future in pending[len(results):]:
+                future.set_exception(error)
@@ -1,9 +1,10 @@
 """
-Command-line interface for the Documetor package.
+Command-line interface for the Documentor package.
 """
 
 import json
 import os
+from collections import Counter
 from typing import Optional, Dict, Any, List
 
 import typer
@@ -17,6 +18,7 @@ from documentor.config import (
     DEFAULT_CHUNK_STRATEGY, get_default_project_id
 )
 from documentor.core.embedder import DocumentEmbedder
+from documentor.storage.local import LocalVectorStore
 
 # Initialize CLI app
 app = typer.Typer(
@@ -28,7 +30,7 @@ app = typer.Typer(
 @app.callback()
 def callback():
     """
-    Documetor - Document embeddings and semantic search with Google Vertex AI.
+    Documentor - Document embeddings and semantic search with Google Vertex AI.
     """
     pass
 console = Console()
@@ -128,28 +130,24 @@ def info_command(
 ):
     """Display information about a local vector store"""
     try:
-        if not os.path.exists(store_path):
+        if not LocalVectorStore.exists(store_path):
             console.print(f"[red]Error: Vector store file not found: {store_path}[/red]")
             raise typer.Exit(code=1)
         
-        # Load the vector store
-        import pickle
-        with open(store_path, 'rb') as f:
-            embeddings, metadata = pickle.load(f)
+        # Load the vector store (embeddings are memory-mapped, not read)
+        store = LocalVectorStore(store_path=store_path)
+        embeddings, metadata = store.embeddings, store.metadata
         
         # Collect stats
-        num_documents = len({meta["source"] for meta in metadata})
-        sources = sorted({meta["source"] for meta in metadata})
-        chunks_per_source = {}
-        for meta in metadata:
-            source = meta["source"]
-            chunks_per_source[source] = chunks_per_source.get(source, 0) + 1
+        chunks_per_source = Counter(meta["source"] for meta in metadata)
+        sources = sorted(chunks_per_source)
+        num_documents = len(chunks_per_source)
         
         # Display info
         console.print(f"[bold]Vector Store: {store_path}[/bold]")
         console.print(f"Total vectors: {len(embeddings)}")
         console.print(f"Total documents: {num_documents}")
-        console.print(f"Vector dimensions: {len(embeddings[0]) if embeddings else 'N/A'}")
+        console.print(f"Vector dimensions: {embeddings.shape[1] if len(embeddings) else 'N/A'}")
         
         console.print("\n[bold]Documents:[/bold]")
         table = Table(show_header=True, header_style="bold")
@@ -183,6 +181,7 @@ def process(
     batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, "--batch-size", help="Number of documents to process in batch"),
     max_workers: int = typer.Option(DEFAULT_MAX_WORKERS, "--max-workers", help="Maximum number of concurrent workers"),
     use_ocr: bool = typer.Option(False, "--use-ocr", help="Use OCR for PDF text extraction"),
+    extraction_workers: int = typer.Option(0, "--extraction-workers", help="Processes for CPU-bound text extraction (0 to extract on the worker threads)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed output"),
     silent: bool = typer.Option(False, "--silent", "-s", help="Suppress all output"),
     log_level: str = typer.Option("INFO", "--log-level", help="Logging level (DEBUG, INFO, WARNING, ERROR)")
@@ -211,6 +210,7 @@ def process(
             batch_size=batch_size,
             max_workers=max_workers,
             use_ocr=use_ocr,
+            extraction_workers=extraction_workers,
             verbose=verbose,
             silent=silent,
             log_level=log_level
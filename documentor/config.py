@@ -1,5 +1,5 @@
 """
-Configuration settings for the Documetor package.
+Configuration settings for the Documentor package.
 """
 
 import os
@@ -16,16 +16,28 @@ logging.basicConfig(
 )
 
 # Create logger
-logger = logging.getLogger("documetor")
+logger = logging.getLogger("documentor")
 
 # Default values
 DEFAULT_CHUNK_SIZE = 1000
 DEFAULT_CHUNK_OVERLAP = 200
 DEFAULT_BATCH_SIZE = 5
+DEFAULT_MAX_API_BATCH_SIZE = 250
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
 DEFAULT_MAX_WORKERS = 4
 DEFAULT_LOCATION = "us-central1"
 DEFAULT_EMBEDDING_MODEL = "textembedding-gecko@latest"
 DEFAULT_CHUNK_STRATEGY = "hybrid"
+DEFAULT_CACHE_THRESHOLD = 0.86
+DEFAULT_CACHE_MERGE_THRESHOLD = 0.8
+DEFAULT_CACHE_SIZE = 0
+DEFAULT_EMBEDDING_MAX_BATCH = 64
+DEFAULT_EMBEDDING_MAX_WAIT_MS = 10
+DEFAULT_SEARCH_MAX_BATCH = 64
+DEFAULT_SEARCH_MAX_WAIT_MS = 10
+DEFAULT_FILE_QUEUE_SIZE = 1000
+DEFAULT_CHUNK_CACHE_MEMORY_SIZE = 10000
+DEFAULT_OCR_THREADS = 2
 
 # Context manager for "no operation" when progress is disabled
 class NullContext:
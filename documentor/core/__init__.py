@@ -1,7 +1,8 @@
 """
-Core functionality for the Documetor package.
+Core functionality for the Documentor package.
 """
 
+from documentor.core.cache import SemanticCache
 from documentor.core.embedder import DocumentEmbedder
 
-__all__ = ['DocumentEmbedder']
+__all__ = ['DocumentEmbedder', 'SemanticCache']
@@ -0,0 +1,215 @@
+"""
+Semantic query cache for search results.
+"""
+
+import threading
+from typing import List, Dict, Any, Optional, Hashable
+
+import numpy as np
+
+from documentor.config import DEFAULT_CACHE_THRESHOLD, DEFAULT_CACHE_MERGE_THRESHOLD
+
+
+class SemanticCache:
+    """
+    Cache that returns stored search results for semantically similar queries
+
+    Similar queries are clustered: each cached entry holds the normalized
+    running mean (centroid) of the queries whose results were stored in it.
+    A query that misses is stored in an existing entry instead of a new row
+    when it is within the looser merge_threshold of that entry's centroid,
+    so paraphrases of a query share one row. Lookups never move a centroid,
+    so a run of hits cannot drag an entry away from the queries its results
+    were computed for.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_CACHE_THRESHOLD,
+        max_size: int = 1000,
+        merge_threshold: float = DEFAULT_CACHE_MERGE_THRESHOLD
+    ):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached query to count as a hit
+            max_size: Maximum number of cached queries (least recently used are evicted)
+            merge_threshold: Minimum cosine similarity for a stored query to be folded
+                into an existing entry (at most threshold)
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        self.merge_threshold = min(merge_threshold, threshold)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        """Remove all cached queries"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        """Reset internal state (caller must hold the lock)"""
+        self._centroids: Optional[np.ndarray] = None
+        self._counts = np.empty(0, dtype=np.int64)
+        self._key_ids = np.empty(0, dtype=np.int64)
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._results: List[List[Dict[str, Any]]] = []
+        self._key_map: Dict[Hashable, int] = {}
+        self._next_key_id = 0
+        self._clock = 0
+
+    def get(
+        self,
+        query_embedding: List[float],
+        key: Hashable = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up results for a query embedding
+
+        Args:
+            query_embedding: Query embedding vector
+            key: Search parameters the cached results must have been produced with
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            key_id = self._key_map.get(key)
+            if key_id is None:
+                return None
+
+            best = self._match(query, key_id, self.threshold)
+            if best < 0:
+                return None
+
+            self._touch(best)
+            return [result.copy() for result in self._results[best]]
+
+    def put(
+        self,
+        query_embedding: List[float],
+        results: List[Dict[str, Any]],
+        key: Hashable = None
+    ) -> None:
+        """
+        Store results for a query embedding
+
+        Args:
+            query_embedding: Query embedding vector
+            results: Search results for the query
+            key: Search parameters the results were produced with
+        """
+        if self.max_size <= 0:
+            return
+
+        query = self._normalize(query_embedding)
+        results = [result.copy() for result in results]
+
+        with self._lock:
+            key_id = self._key_map.get(key)
+            if key_id is None:
+                key_id = self._key_map[key] = self._next_key_id
+                self._next_key_id += 1
+
+            # Fold paraphrases of a cached query into its entry
+            best = self._match(query, key_id, self.merge_threshold)
+            if best >= 0:
+                self._merge(best, query)
+                self._results[best] = results
+                return
+
+            self._clock += 1
+
+            if self._centroids is None:
+                self._centroids = query[np.newaxis, :]
+                self._counts = np.ones(1, dtype=np.int64)
+                self._key_ids = np.array([key_id], dtype=np.int64)
+                self._last_used = np.array([self._clock], dtype=np.int64)
+                self._results = [results]
+            elif len(self._results) < self.max_size:
+                self._centroids = np.vstack([self._centroids, query])
+                self._counts = np.append(self._counts, 1)
+                self._key_ids = np.append(self._key_ids, key_id)
+                self._last_used = np.append(self._last_used, self._clock)
+                self._results.append(results)
+            else:
+                # Overwrite the least recently used entry in place
+                lru = int(np.argmin(self._last_used))
+                if self._key_ids[lru] != key_id:
+                    self._evict_key(int(self._key_ids[lru]), lru)
+                self._centroids[lru] = query
+                self._counts[lru] = 1
+                self._key_ids[lru] = key_id
+                self._last_used[lru] = self._clock
+                self._results[lru] = results
+
+    def _match(self, query: np.ndarray, key_id: int, threshold: float) -> int:
+        """
+        Find the closest centroid for a query (caller must hold the lock)
+
+        Args:
+            query: Normalized query embedding
+            key_id: Internal id of the search parameters
+            threshold: Minimum cosine similarity of a match
+
+        Returns:
+            Index of the matching centroid, or -1 if none is within the threshold
+        """
+        if self._centroids is None:
+            return -1
+
+        similarity = np.dot(self._centroids, query)
+        similarity[self._key_ids != key_id] = -np.inf
+        best = int(np.argmax(similarity))
+        return best if similarity[best] >= threshold else -1
+
+    def _merge(self, index: int, query: np.ndarray) -> None:
+        """
+        Fold a query into a centroid as a running mean (caller must hold the lock)
+
+        Args:
+            index: Index of the centroid
+            query: Normalized query embedding
+        """
+        count = self._counts[index]
+        centroid = (self._centroids[index] * count + query) / (count + 1)
+        norm = np.linalg.norm(centroid)
+        if norm > 0:
+            centroid /= norm
+        self._centroids[index] = centroid
+        self._counts[index] = count + 1
+        self._touch(index)
+
+    def _touch(self, index: int) -> None:
+        """Mark an entry as most recently used (caller must hold the lock)"""
+        self._clock += 1
+        self._last_used[index] = self._clock
+
+    def _evict_key(self, key_id: int, index: int) -> None:
+        """
+        Forget search parameters whose last entry is being overwritten (caller must hold the lock)
+
+        Args:
+            key_id: Internal id of the search parameters of the entry
+            index: Index of the entry being overwritten
+        """
+        others = np.flatnonzero(self._key_ids == key_id)
+        if len(others) == 1 and others[0] == index:
+            for key, value in self._key_map.items():
+                if value == key_id:
+                    del self._key_map[key]
+                    break
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """L2-normalize an embedding as float32"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
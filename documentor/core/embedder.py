@@ -5,23 +5,174 @@ embedding generation, and vector storage.
 
 import os
 import time
+import queue
+import threading
 import concurrent.futures
-from typing import List, Dict, Any, Optional
+import multiprocessing
+from typing import List, Dict, Any, Optional, Iterable, Iterator, FrozenSet
 
+import numpy as np
 from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn, TimeRemainingColumn
 
 from documentor.config import (
     logger, DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_OVERLAP, DEFAULT_LOCATION,
     DEFAULT_EMBEDDING_MODEL, DEFAULT_BATCH_SIZE, DEFAULT_MAX_WORKERS,
-    DEFAULT_CHUNK_STRATEGY, NullContext
+    DEFAULT_CHUNK_STRATEGY, DEFAULT_CACHE_THRESHOLD, DEFAULT_CACHE_SIZE,
+    DEFAULT_FILE_QUEUE_SIZE, NullContext
 )
-from documentor.processors import get_processor_for_file
-from documentor.processors.pdf import PDFProcessor
+from documentor.core.cache import SemanticCache
+from documentor.processors import get_processor_for_file, get_registered_processors, register_processor
 from documentor.text.chunker import TextChunker
 from documentor.embedding.vertex import VertexEmbeddings
+from documentor.embedding.batching import BatchingEmbedder
+from documentor.embedding.cache import ChunkEmbeddingCache
 from documentor.storage.base import VectorStore
 from documentor.storage.local import LocalVectorStore
-from documentor.storage.vertex import VertexMatchingEngineStore
+from documentor.storage.batching import BatchingSearcher
+
+# Marks the end of the file stream produced by the directory walker
+_END_OF_FILES = object()
+
+
+def _iter_files(root: str, recursive: bool, extensions: FrozenSet[str]) -> Iterator[str]:
+    """
+    Yield paths of files under a directory with a supported extension
+    
+    Uses os.scandir so file/directory checks reuse the type information
+    returned by the directory listing instead of issuing a stat per entry.
+    
+    Args:
+        root: Directory to scan
+        recursive: Whether to descend into subdirectories
+        extensions: Lower-case file extensions to include (e.g. '.pdf')
+        
+    Yields:
+        Paths of matching files
+    """
+    subdirectories = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                    yield entry.path
+    except OSError as e:
+        logger.warning("Could not read directory %s: %s", root, e)
+        return
+    
+    # Descend after closing this directory's handle to bound open descriptors
+    for subdirectory in subdirectories:
+        yield from _iter_files(subdirectory, recursive, extensions)
+
+
+def extract_and_chunk(file_path: str, chunker: TextChunker, use_ocr: bool = False) -> List[str]:
+    """
+    Extract the text of a document and split it into chunks
+    
+    This is a module-level function so it can run in worker processes.
+    
+    Args:
+        file_path: Path to document file
+        chunker: Chunker used to split the text
+        use_ocr: Whether to use OCR for PDF text extraction
+        
+    Returns:
+        List of text chunks (empty if no text could be extracted)
+    """
+    # Get appropriate processor (OCR-enabled for PDFs if requested)
+    processor = get_processor_for_file(file_path, use_ocr=use_ocr)
+    
+    # Extract text
+    text = processor.extract_text(file_path)
+    
+    # Check if we got any text
+    if not text or not text.strip():
+        logger.warning("No text extracted from %s", file_path)
+        return []
+    
+    # Chunk text
+    chunks = chunker.chunk_text(text)
+    
+    # Skip if no chunks
+    if not chunks:
+        logger.warning("No chunks created from %s", file_path)
+    
+    return chunks
+
+
+def _init_extraction_worker(processors: Dict[str, type], use_ocr: bool) -> None:
+    """
+    Prepare an extraction worker process
+    
+    Args:
+        processors: Processor registry of the parent process (extension -> class)
+        use_ocr: Whether OCR will be used, in which case its libraries are imported up front
+    """
+    # Custom processors registered at runtime are not visible to spawned processes
+    for extension, processor_class in processors.items():
+        register_processor(extension, processor_class)
+    
+    if use_ocr:
+        try:
+            import pytesseract  # noqa: F401
+            import pdf2image  # noqa: F401
+        except ImportError:
+            pass
+
+
+def _enqueue_files(
+    root: str,
+    recursive: bool,
+    extensions: FrozenSet[str],
+    file_queue: "queue.Queue",
+    stop: threading.Event
+) -> None:
+    """
+    Put the paths yielded by _iter_files onto a queue, followed by an end marker
+    
+    Args:
+        root: Directory to scan
+        recursive: Whether to descend into subdirectories
+        extensions: Lower-case file extensions to include
+        file_queue: Queue receiving the file paths
+        stop: Event set when the consumer has stopped reading the queue
+    """
+    try:
+        for file_path in _iter_files(root, recursive, extensions):
+            if stop.is_set():
+                break
+            file_queue.put(file_path)
+    except Exception as e:
+        logger.error("Error scanning %s: %s", root, e)
+    finally:
+        file_queue.put(_END_OF_FILES)
+
+
+def _iter_queue(file_queue: "queue.Queue") -> Iterator[str]:
+    """
+    Yield paths from a queue filled by _enqueue_files until the end marker
+    
+    Args:
+        file_queue: Queue of file paths
+        
+    Yields:
+        File paths
+    """
+    while True:
+        file_path = file_queue.get()
+        if file_path is _END_OF_FILES:
+            return
+        yield file_path
+
+
+def _drain(file_queue: "queue.Queue") -> None:
+    """Remove all items currently in a queue"""
+    try:
+        while True:
+            file_queue.get_nowait()
+    except queue.Empty:
+        pass
 
 
 class DocumentEmbedder:
@@ -42,6 +193,10 @@ class DocumentEmbedder:
         batch_size: int = DEFAULT_BATCH_SIZE,
         max_workers: int = DEFAULT_MAX_WORKERS,
         use_ocr: bool = False,
+        extraction_workers: int = 0,
+        cache_threshold: float = DEFAULT_CACHE_THRESHOLD,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        chunk_cache_path: Optional[str] = None,
         verbose: bool = False,
         silent: bool = False,
         log_level: str = "INFO"
@@ -63,6 +218,13 @@ class DocumentEmbedder:
             batch_size: Number of documents to process in batch
             max_workers: Maximum number of concurrent workers
             use_ocr: Whether to use OCR for PDF text extraction
+            extraction_workers: Number of processes for text extraction and chunking
+                (0 extracts on the embedding threads)
+            cache_threshold: Cosine similarity at which a previous query's results are reused
+            cache_size: Maximum number of cached queries (0, the default, disables the query cache;
+                cached results are approximate, being reused for any query within cache_threshold)
+            chunk_cache_path: SQLite file for reusing chunk embeddings across runs (None for in-memory only).
+                Entries are keyed by model name, so only share a file between runs that pin a model version
             verbose: Whether to show detailed output
             silent: Whether to suppress all output
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
@@ -82,6 +244,7 @@ class DocumentEmbedder:
         self.use_ocr = use_ocr
         self.batch_size = batch_size
         self.max_workers = max_workers
+        self.extraction_workers = extraction_workers
         self.verbose = verbose
         self.silent = silent
         
@@ -100,19 +263,40 @@ class DocumentEmbedder:
             batch_size=batch_size
         )
         
+        # Coalesce embedding requests from concurrent file workers
+        self.embedding_batcher = BatchingEmbedder(
+            self.embeddings_generator,
+            max_concurrency=max_workers
+        )
+        
+        # Reuse embeddings of chunks that were already embedded
+        self.chunk_cache = ChunkEmbeddingCache(embedding_model, path=chunk_cache_path)
+        
+        # Set up query cache
+        self.query_cache = SemanticCache(
+            threshold=cache_threshold,
+            max_size=cache_size
+        ) if cache_size > 0 else None
+        
         # Set up vector store
+        self.search_batcher = None
         if vector_store:
             self.vector_store = vector_store
         elif store_type == "vertex":
+            # Imported here so local-only use doesn't load the Matching Engine client
+            from documentor.storage.vertex import VertexMatchingEngineStore
             self.vector_store = VertexMatchingEngineStore(
                 project_id=project_id,
                 location=location,
+                # Existing deployments created their index under this historical name
                 index_name=index_name or "documetor_embeddings"
             )
+            # Send concurrent searches to the index endpoint in shared requests
+            self.search_batcher = BatchingSearcher(self.vector_store, max_concurrency=max_workers)
         else:  # default to local
             self.vector_store = LocalVectorStore(store_path=store_path)
         
-        logger.info(f"DocumentEmbedder initialized with {store_type} vector store")
+        logger.info("DocumentEmbedder initialized with %s vector store", store_type)
     
     def process_directory(self, directory_path: str, recursive: bool = True) -> None:
         """
@@ -124,33 +308,52 @@ class DocumentEmbedder:
         """
         from documentor.processors import get_supported_extensions
         
-        # Get list of supported files
-        supported_extensions = get_supported_extensions()
-        files = []
+        supported_extensions = frozenset(get_supported_extensions())
         
-        # Walk directory
-        walk_fn = os.walk if recursive else lambda d: [(d, [], [f for f in os.listdir(d) if os.path.isfile(os.path.join(d, f))])]
+        # Walk the directory on a background thread so processing starts with
+        # the first file found instead of after the whole tree has been listed
+        file_queue: "queue.Queue" = queue.Queue(maxsize=DEFAULT_FILE_QUEUE_SIZE)
+        stop = threading.Event()
+        walker = threading.Thread(
+            target=_enqueue_files,
+            args=(directory_path, recursive, supported_extensions, file_queue, stop),
+            name="directory-walker",
+            daemon=True
+        )
+        walker.start()
+        files = _iter_queue(file_queue)
         
-        for root, _, filenames in walk_fn(directory_path):
-            for filename in filenames:
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in supported_extensions:
-                    files.append(os.path.join(root, filename))
+        try:
+            # Process files in parallel
+            if self.max_workers > 1:
+                num_files = self._process_files_parallel(files)
+            else:
+                num_files = self._process_files_sequential(files)
+        finally:
+            # If processing failed the walker may be blocked on the full
+            # queue; stop it and drain the queue until it has finished
+            stop.set()
+            while walker.is_alive():
+                _drain(file_queue)
+                walker.join(timeout=0.1)
         
-        if not files:
-            logger.warning(f"No supported documents found in {directory_path}")
+        if not num_files:
+            logger.warning("No supported documents found in %s", directory_path)
             return
         
-        logger.info(f"Found {len(files)} documents to process")
-        
-        # Process files in parallel
-        if self.max_workers > 1 and len(files) > 1:
-            self._process_files_parallel(files)
-        else:
-            self._process_files_sequential(files)
+        logger.info("Processed %d documents", num_files)
     
-    def _process_files_sequential(self, files: List[str]) -> None:
-        """Process files sequentially with progress bar"""
+    def _process_files_sequential(self, files: Iterable[str]) -> int:
+        """
+        Process files sequentially with progress bar
+        
+        Args:
+            files: Paths of files to process (consumed lazily)
+            
+        Returns:
+            Number of files seen
+        """
+        num_files = 0
         with Progress(
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
@@ -159,17 +362,30 @@ class DocumentEmbedder:
             TimeRemainingColumn(),
             disable=self.silent
         ) as progress:
-            task_id = progress.add_task("Processing documents", total=len(files))
+            task_id = progress.add_task("Processing documents", total=None)
             
             for file_path in files:
+                num_files += 1
+                progress.update(task_id, total=num_files)
                 try:
                     self.process_file(file_path, show_progress=False)
                     progress.update(task_id, advance=1)
                 except Exception as e:
-                    logger.error(f"Error processing {file_path}: {str(e)}")
+                    logger.error("Error processing %s: %s", file_path, e)
+        
+        return num_files
     
-    def _process_files_parallel(self, files: List[str]) -> None:
-        """Process files in parallel with progress bar"""
+    def _process_files_parallel(self, files: Iterable[str]) -> int:
+        """
+        Process files in parallel with progress bar
+        
+        Args:
+            files: Paths of files to process (consumed lazily)
+            
+        Returns:
+            Number of files seen
+        """
+        num_files = 0
         with Progress(
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
@@ -178,23 +394,66 @@ class DocumentEmbedder:
             TimeRemainingColumn(),
             disable=self.silent
         ) as progress:
-            task_id = progress.add_task("Processing documents", total=len(files))
+            # The total grows as files are discovered
+            task_id = progress.add_task("Processing documents", total=None)
+            
+            # Cap in-flight work so queued results don't pile up in memory
+            in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+            
+            def on_done(future: concurrent.futures.Future, file_path: str) -> None:
+                in_flight.release()
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("Error processing %s: %s", file_path, e)
+                progress.update(task_id, advance=1)
             
-            # Process in batches to avoid memory issues
-            for i in range(0, len(files), self.batch_size):
-                batch = files[i:i+self.batch_size]
-                
-                with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    futures = {executor.submit(self.process_file, file_path, False): file_path for file_path in batch}
-                    
-                    for future in concurrent.futures.as_completed(futures):
-                        file_path = futures[future]
-                        try:
-                            future.result()
-                        except Exception as e:
-                            logger.error(f"Error processing {file_path}: {str(e)}")
-                        
-                        progress.update(task_id, advance=1)
+            def on_extracted(future: concurrent.futures.Future, file_path: str) -> None:
+                # Hand extracted chunks over to the embedding threads
+                try:
+                    chunks = future.result()
+                except Exception:
+                    on_done(future, file_path)
+                    return
+                if not chunks:
+                    on_done(future, file_path)
+                    return
+                try:
+                    embedding = executor.submit(self._embed_and_store, file_path, chunks)
+                except Exception as e:
+                    # e.g. the thread pool is shutting down; the slot must
+                    # still be released or the submitting loop blocks forever
+                    logger.error("Error processing %s: %s", file_path, e)
+                    on_done(future, file_path)
+                    return
+                embedding.add_done_callback(lambda f: on_done(f, file_path))
+            
+            # CPU-bound extraction (PDF parsing, OCR, chunking) optionally runs
+            # in separate processes; embedding stays on the thread pool. Workers
+            # are spawned because forking would copy the event loop and walker threads
+            extractor_context = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.extraction_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extraction_worker,
+                initargs=(get_registered_processors(), self.use_ocr)
+            ) if self.extraction_workers > 0 else NullContext()
+            
+            # One pool for the whole run keeps threads and API clients warm
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                    extractor_context as extractor:
+                for file_path in files:
+                    num_files += 1
+                    progress.update(task_id, total=num_files)
+                    in_flight.acquire()
+                    if extractor is None:
+                        future = executor.submit(self.process_file, file_path, False)
+                        future.add_done_callback(lambda f, path=file_path: on_done(f, path))
+                    else:
+                        logger.info("Processing %s", file_path)
+                        future = extractor.submit(extract_and_chunk, file_path, self.chunker, self.use_ocr)
+                        future.add_done_callback(lambda f, path=file_path: on_extracted(f, path))
+        
+        return num_files
     
     def process_file(self, file_path: str, show_progress: bool = True) -> bool:
         """
@@ -207,59 +466,97 @@ class DocumentEmbedder:
         Returns:
             True if processing was successful, False otherwise
         """
-        logger.info(f"Processing {file_path}")
+        logger.info("Processing %s", file_path)
         
         try:
-            # Get appropriate processor
-            processor = get_processor_for_file(file_path)
-            
-            # If we need OCR for PDFs, initialize with OCR flag
-            if self.use_ocr and isinstance(processor, PDFProcessor):
-                processor.use_ocr = True
-            
-            # Extract text
-            text = processor.extract_text(file_path)
-            
-            # Check if we got any text
-            if not text or not text.strip():
-                logger.warning(f"No text extracted from {file_path}")
-                return False
-            
-            # Chunk text
-            chunks = self.chunker.chunk_text(text)
-            
-            # Skip if no chunks
+            chunks = extract_and_chunk(file_path, self.chunker, self.use_ocr)
             if not chunks:
-                logger.warning(f"No chunks created from {file_path}")
                 return False
             
-            logger.info(f"Created {len(chunks)} chunks from {file_path}")
-            
-            # Generate embeddings
-            embeddings = self.embeddings_generator.get_embeddings(chunks, show_progress=show_progress and self.verbose)
-            
-            # Create metadata
-            metadata = []
-            for i, chunk in enumerate(chunks):
-                metadata.append({
-                    "id": f"{os.path.basename(file_path)}_{i}",
-                    "source": file_path,
-                    "chunk_index": i,
-                    "text": chunk,
-                    "total_chunks": len(chunks),
-                    "extraction_time": time.time()
-                })
-            
-            # Add to vector store
-            self.vector_store.add_embeddings(embeddings, metadata)
-            
-            logger.info(f"Successfully processed {file_path}")
-            return True
+            return self._embed_and_store(file_path, chunks, show_progress=show_progress)
             
         except Exception as e:
-            logger.error(f"Error processing {file_path}: {str(e)}")
+            logger.error("Error processing %s: %s", file_path, e)
             return False
     
+    def _embed_and_store(self, file_path: str, chunks: List[str], show_progress: bool = False) -> bool:
+        """
+        Embed the chunks of a file and add them to the vector store
+        
+        Args:
+            file_path: Path to the document the chunks came from
+            chunks: Text chunks of the document
+            show_progress: Whether to show progress bars
+            
+        Returns:
+            True once the chunks have been stored
+        """
+        logger.info("Created %d chunks from %s", len(chunks), file_path)
+        
+        # Generate embeddings
+        embeddings = self._embed_chunks(chunks, show_progress=show_progress and self.verbose)
+        
+        # Create metadata (values shared by all chunks are computed once)
+        now = time.time()
+        base_name = os.path.basename(file_path)
+        total_chunks = len(chunks)
+        metadata = [
+            {
+                "id": f"{base_name}_{i}",
+                "source": file_path,
+                "chunk_index": i,
+                "text": chunk,
+                "total_chunks": total_chunks,
+                "extraction_time": now
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        # Add to vector store
+        self.vector_store.add_embeddings(embeddings, metadata)
+        
+        # Cached search results may no longer reflect the store contents
+        if self.query_cache is not None:
+            self.query_cache.clear()
+        
+        logger.info("Successfully processed %s", file_path)
+        return True
+    
+    def _embed_chunks(self, chunks: List[str], show_progress: bool = False) -> np.ndarray:
+        """
+        Generate embeddings for chunks, only calling the API for unseen chunks
+        
+        Args:
+            chunks: List of text chunks
+            show_progress: Whether to show a progress bar
+            
+        Returns:
+            Float32 matrix of embedding vectors, one row per chunk
+        """
+        keys = [self.chunk_cache.key(chunk) for chunk in chunks]
+        cached = self.chunk_cache.get_many(keys)
+        
+        # Embed each distinct missing chunk once
+        new_keys, new_chunks = [], []
+        seen = set(cached)
+        for key, chunk in zip(keys, chunks):
+            if key not in seen:
+                seen.add(key)
+                new_keys.append(key)
+                new_chunks.append(chunk)
+        
+        if new_chunks:
+            logger.debug("Embedding %d new chunks (%d reused)", len(new_chunks), len(chunks) - len(new_chunks))
+            # Per-file progress needs a dedicated call rather than the shared batcher
+            if show_progress:
+                new_embeddings = self.embeddings_generator.get_embeddings(new_chunks, show_progress=True)
+            else:
+                new_embeddings = self.embedding_batcher.get_embeddings(new_chunks)
+            self.chunk_cache.put_many(new_keys, new_embeddings)
+            cached.update(zip(new_keys, new_embeddings))
+        
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
     def search(
         self, 
         query: str, 
@@ -277,17 +574,73 @@ class DocumentEmbedder:
         Returns:
             List of search results with metadata
         """
-        logger.info(f"Searching for: {query}")
+        logger.info("Searching for: %s", query)
         
         # Generate embedding for query
         query_embedding = self.embeddings_generator.get_embeddings([query])[0]
         
+        # Reuse results of a semantically similar earlier query if possible
+        cache_key = (top_k, tuple(sorted((key, repr(value)) for key, value in (filters or {}).items())))
+        if self.query_cache is not None:
+            results = self.query_cache.get(query_embedding, key=cache_key)
+            if results is not None:
+                logger.info("Found %d results (cached)", len(results))
+                return results
+        
         # Search vector store
-        results = self.vector_store.search(
+        searcher = self.search_batcher or self.vector_store
+        results = searcher.search(
             query_embedding, 
             top_k=top_k,
             filters=filters
         )
         
-        logger.info(f"Found {len(results)} results")
+        if self.query_cache is not None:
+            self.query_cache.put(query_embedding, results, key=cache_key)
+        
+        logger.info("Found %d results", len(results))
+        return results
+    
+    def search_batch(
+        self, 
+        queries: List[str], 
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for documents similar to each of several queries
+        
+        The queries are embedded with one call and looked up in the vector store
+        with one batched search.
+        
+        Args:
+            queries: Query texts
+            top_k: Number of results to return per query
+            filters: Dictionary of metadata fields to filter on (applied to every query)
+            
+        Returns:
+            List of search results with metadata for each query
+        """
+        if not queries:
+            return []
+        logger.info("Searching for %d queries", len(queries))
+        
+        query_embeddings = self.embeddings_generator.get_embeddings(queries)
+        
+        # Only queries without semantically similar cached results go to the store
+        cache_key = (top_k, tuple(sorted((key, repr(value)) for key, value in (filters or {}).items())))
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        if self.query_cache is not None:
+            for i, query_embedding in enumerate(query_embeddings):
+                results[i] = self.query_cache.get(query_embedding, key=cache_key)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            found = self.vector_store.search_batch(query_embeddings[missing], top_k=top_k, filters=filters)
+            for i, result in zip(missing, found):
+                results[i] = result
+                if self.query_cache is not None:
+                    self.query_cache.put(query_embeddings[i], result, key=cache_key)
+        
+        logger.info("Found results for %d queries (%d cached)", len(queries), len(queries) - len(missing))
         return results
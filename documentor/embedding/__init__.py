@@ -3,5 +3,7 @@ Embedding generation functionality.
 """
 
 from documentor.embedding.vertex import VertexEmbeddings
+from documentor.embedding.batching import BatchingEmbedder
+from documentor.embedding.cache import ChunkEmbeddingCache
 
-__all__ = ['VertexEmbeddings']
+__all__ = ['VertexEmbeddings', 'BatchingEmbedder', 'ChunkEmbeddingCache']
@@ -0,0 +1,93 @@
+"""
+Request coalescing for embedding generation.
+"""
+
+from typing import List
+
+import numpy as np
+
+from documentor.config import logger, DEFAULT_EMBEDDING_MAX_BATCH, DEFAULT_EMBEDDING_MAX_WAIT_MS
+from documentor._batching import MicroBatcher, Pending
+
+
+class BatchingEmbedder(MicroBatcher):
+    """
+    Wrapper that coalesces concurrent get_embeddings calls into larger batches
+
+    Callers on any thread submit their texts and block until the result is
+    ready. A background thread collects pending requests until max_batch texts
+    are queued or max_wait_ms has passed, then embeds them with a single call
+    to the wrapped embedder and hands each caller its slice of the result.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        max_batch: int = DEFAULT_EMBEDDING_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_EMBEDDING_MAX_WAIT_MS,
+        max_concurrency: int = 1
+    ):
+        """
+        Initialize the batching embedder
+
+        Args:
+            embedder: Embeddings generator with a get_embeddings(texts) method
+            max_batch: Number of texts after which a batch is sent immediately
+            max_wait_ms: Maximum time to wait for more requests before sending a batch
+            max_concurrency: Maximum number of batches being embedded at once
+        """
+        super().__init__(max_batch, max_wait_ms, max_concurrency, thread_name="embedding-batcher")
+        self.embedder = embedder
+
+    def get_embeddings(
+        self,
+        texts: List[str],
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts
+
+        Args:
+            texts: List of text chunks to embed
+            show_progress: Ignored; batches mix texts from several callers
+
+        Returns:
+            Float32 matrix of embedding vectors, one row per text
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._submit(texts)
+
+    def _size(self, texts: List[str]) -> int:
+        return len(texts)
+
+    def _flush(self, pending: Pending) -> None:
+        """
+        Embed a batch of requests and resolve their futures
+
+        Args:
+            pending: List of (texts, future) requests
+        """
+        flat_texts = [text for texts, _ in pending for text in texts]
+        logger.debug("Embedding %d texts from %d requests", len(flat_texts), len(pending))
+
+        try:
+            embeddings = self.embedder.get_embeddings(flat_texts)
+        except Exception as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            # Retry requests individually so one bad input doesn't fail the others
+            for texts, future in pending:
+                try:
+                    future.set_result(self.embedder.get_embeddings(texts))
+                except Exception as item_error:
+                    future.set_exception(item_error)
+            return
+
+        results = []
+        offset = 0
+        for texts, _ in pending:
+            results.append(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+        self._resolve(pending, results)
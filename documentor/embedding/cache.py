@@ -0,0 +1,152 @@
+"""
+Content-addressed cache of chunk embeddings.
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from documentor.config import logger, DEFAULT_CHUNK_CACHE_MEMORY_SIZE
+
+# Maximum number of hashes bound to a single SQLite query
+_SQLITE_MAX_PARAMS = 500
+
+
+class ChunkEmbeddingCache:
+    """
+    Cache mapping chunk text to its embedding
+
+    Chunks are keyed by an 8-byte BLAKE2b digest of the model name and chunk
+    text, so repeated boilerplate (headers, footers, legal text) is only sent
+    to the embedding API once. The most recently used entries are kept in
+    memory and, when a path is given, all entries are kept in a SQLite
+    database for reuse across runs.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        path: Optional[str] = None,
+        memory_size: int = DEFAULT_CHUNK_CACHE_MEMORY_SIZE
+    ):
+        """
+        Initialize the chunk cache
+
+        Args:
+            model_name: Embedding model name (embeddings from other models are not reused)
+            path: Path to the SQLite database (None for in-memory only)
+            memory_size: Maximum number of embeddings kept in memory (least recently used are dropped)
+        """
+        self.model_name = model_name
+        self.path = path
+        self.memory_size = memory_size
+        self._prefix = model_name.encode("utf-8") + b"\0"
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, embedding BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.warning("Could not open chunk cache %s, using in-memory cache only: %s", path, e)
+                self._db = None
+
+    def key(self, chunk: str) -> bytes:
+        """
+        Compute the cache key for a chunk
+
+        Args:
+            chunk: Chunk text
+
+        Returns:
+            8-byte digest identifying the chunk for this model
+        """
+        return hashlib.blake2b(self._prefix + chunk.encode("utf-8"), digest_size=8).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dictionary of the keys that were found and their embeddings
+        """
+        with self._lock:
+            found = {}
+            for k in keys:
+                embedding = self._memory.get(k)
+                if embedding is not None:
+                    self._memory.move_to_end(k)
+                    found[k] = embedding
+            missing = [k for k in set(keys) if k not in found]
+
+            if self._db is not None and missing:
+                try:
+                    for i in range(0, len(missing), _SQLITE_MAX_PARAMS):
+                        batch = missing[i:i+_SQLITE_MAX_PARAMS]
+                        placeholders = ",".join("?" * len(batch))
+                        rows = self._db.execute(
+                            f"SELECT hash, embedding FROM embeddings WHERE hash IN ({placeholders})",
+                            batch
+                        )
+                        for k, blob in rows:
+                            embedding = np.frombuffer(blob, dtype=np.float32)
+                            self._remember(k, embedding)
+                            found[k] = embedding
+                except sqlite3.Error as e:
+                    logger.warning("Error reading chunk cache: %s", e)
+
+        return found
+
+    def put_many(self, keys: Sequence[bytes], embeddings: np.ndarray) -> None:
+        """
+        Store embeddings in the cache
+
+        Args:
+            keys: Cache keys
+            embeddings: Matrix of embedding vectors, one row per key
+        """
+        rows = [(k, np.asarray(emb, dtype=np.float32)) for k, emb in zip(keys, embeddings)]
+
+        with self._lock:
+            for k, embedding in rows:
+                self._remember(k, embedding)
+
+            if self._db is not None and rows:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (hash, embedding) VALUES (?, ?)",
+                        [(k, emb.tobytes()) for k, emb in rows]
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Error writing chunk cache: %s", e)
+
+    def _remember(self, key: bytes, embedding: np.ndarray) -> None:
+        """Keep an embedding in memory, dropping the least recently used beyond memory_size (caller must hold the lock)"""
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        """Close the SQLite database"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -3,16 +3,32 @@ Vertex AI embeddings implementation.
 """
 
 import time
+import asyncio
+import threading
 from typing import List
 
+import numpy as np
 from google.cloud import aiplatform
 from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn, TimeRemainingColumn
 
-from documentor.config import logger, DEFAULT_LOCATION, DEFAULT_BATCH_SIZE, NullContext
+from documentor.config import (
+    logger, DEFAULT_LOCATION, DEFAULT_BATCH_SIZE, DEFAULT_MAX_API_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS, NullContext
+)
+
+# Smoothing factor for the per-text latency moving average
+_LATENCY_EWMA_ALPHA = 0.3
 
 
 class VertexEmbeddings:
-    """Class to create embeddings using Google Vertex AI"""
+    """
+    Class to create embeddings using Google Vertex AI
+    
+    API calls are issued asynchronously from a single background event loop
+    owned by the instance, so one thread keeps up to max_concurrent_requests
+    batches in flight. get_embeddings blocks on that loop and can be called
+    from any thread; get_embeddings_async can be awaited from any event loop.
+    """
     
     def __init__(
         self, 
@@ -20,6 +36,8 @@ class VertexEmbeddings:
         location: str = DEFAULT_LOCATION, 
         model_name: str = "textembedding-gecko@latest",
         batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_size: int = DEFAULT_MAX_API_BATCH_SIZE,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
         max_retries: int = 3,
         retry_delay: int = 2
     ):
@@ -30,7 +48,9 @@ class VertexEmbeddings:
             project_id: Google Cloud project ID
             location: Google Cloud region
             model_name: Vertex AI model name for embeddings
-            batch_size: Number of texts to embed in a single API call
+            batch_size: Initial number of texts to embed in a single API call
+            max_batch_size: Upper bound for the adaptively grown batch size
+            max_concurrent_requests: Maximum number of API calls in flight at once
             max_retries: Maximum number of retries for API calls
             retry_delay: Delay between retries in seconds
         """
@@ -38,6 +58,8 @@ class VertexEmbeddings:
         self.location = location
         self.model_name = model_name
         self.batch_size = batch_size
+        self.max_batch_size = max(max_batch_size, batch_size)
+        self.max_concurrent_requests = max_concurrent_requests
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
@@ -46,6 +68,16 @@ class VertexEmbeddings:
         
         # Model will be lazily initialized when needed
         self._model = None
+        
+        # Batch size adapts to observed API latency (see _adapt_batch_size)
+        self._batch_lock = threading.Lock()
+        self._effective_batch_size = batch_size
+        self._latency_ewma = None
+        
+        # Event loop for API calls, started on first use
+        self._loop_lock = threading.Lock()
+        self._loop = None
+        self._semaphore = None
     
     @property
     def model(self):
@@ -58,7 +90,7 @@ class VertexEmbeddings:
         self, 
         texts: List[str], 
         show_progress: bool = False
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generate embeddings for a list of texts
         
@@ -67,10 +99,63 @@ class VertexEmbeddings:
             show_progress: Whether to show a progress bar
             
         Returns:
-            List of embedding vectors
+            Float32 matrix of embedding vectors, one row per text
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._embed_all(texts, show_progress),
+            self._get_loop()
+        )
+        return future.result()
+    
+    async def get_embeddings_async(
+        self, 
+        texts: List[str], 
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts without blocking the event loop
+        
+        Args:
+            texts: List of text chunks to embed
+            show_progress: Whether to show a progress bar
+            
+        Returns:
+            Float32 matrix of embedding vectors, one row per text
+        """
+        loop = self._get_loop()
+        if asyncio.get_running_loop() is loop:
+            return await self._embed_all(texts, show_progress)
+        # The async API client is bound to our loop, so run there
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._embed_all(texts, show_progress), loop)
+        )
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="vertex-embeddings", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+    
+    async def _embed_all(self, texts: List[str], show_progress: bool) -> np.ndarray:
+        """
+        Embed texts in concurrent batches (runs on the background loop)
+        
+        Args:
+            texts: List of text chunks to embed
+            show_progress: Whether to show a progress bar
+            
+        Returns:
+            Float32 matrix of embedding vectors, one row per text
         """
-        all_embeddings = []
-        total_batches = (len(texts) + self.batch_size - 1) // self.batch_size
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
         
         # Create progress bar if requested
         progress_context = Progress(
@@ -81,35 +166,131 @@ class VertexEmbeddings:
             TimeRemainingColumn(),
         ) if show_progress else NullContext()
         
+        # Allocated once the first batch reveals the embedding dimension
+        all_embeddings = None
+        
         try:
             with progress_context as progress:
                 if show_progress:
                     task_id = progress.add_task("Generating embeddings", total=len(texts))
                 
-                for i in range(0, len(texts), self.batch_size):
-                    batch_texts = texts[i:i+self.batch_size]
-                    
-                    # Retry logic for API calls
-                    for retry in range(self.max_retries):
-                        try:
-                            embeddings = self.model.get_embeddings(batch_texts)
-                            # Extract the embedding values
-                            embedding_values = [emb.values for emb in embeddings]
-                            all_embeddings.extend(embedding_values)
-                            
-                            if show_progress:
-                                progress.update(task_id, advance=len(batch_texts))
-                            
-                            break  # Success, exit retry loop
-                        except Exception as e:
-                            if retry < self.max_retries - 1:
-                                logger.warning(f"Embedding API error (retry {retry+1}/{self.max_retries}): {str(e)}")
-                                time.sleep(self.retry_delay)
-                            else:
-                                logger.error(f"Failed to generate embeddings after {self.max_retries} retries: {str(e)}")
-                                raise
+                async def embed_slice(start: int, stop: int) -> None:
+                    nonlocal all_embeddings
+                    embedding_values = await self._embed_batch(texts[start:stop])
+                    if all_embeddings is None:
+                        all_embeddings = np.empty((len(texts), embedding_values.shape[1]), dtype=np.float32)
+                    all_embeddings[start:stop] = embedding_values
+                    if show_progress:
+                        progress.update(task_id, advance=stop - start)
+                
+                # Slices are cut as requests are dispatched, so batch size
+                # changes from completed calls apply to the rest of the texts
+                pending = set()
+                try:
+                    start = 0
+                    while start < len(texts):
+                        if len(pending) >= self.max_concurrent_requests:
+                            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                            for task in done:
+                                task.result()
+                        stop = min(start + self._effective_batch_size, len(texts))
+                        pending.add(asyncio.ensure_future(embed_slice(start, stop)))
+                        start = stop
+                    await asyncio.gather(*pending)
+                finally:
+                    for task in pending:
+                        task.cancel()
         except Exception as e:
-            logger.error(f"Error generating embeddings: {str(e)}")
+            logger.error("Error generating embeddings: %s", e)
             raise
-            
+        
         return all_embeddings
+    
+    async def _embed_batch(self, batch_texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch with retries
+        
+        Args:
+            batch_texts: Texts for a single API call
+            
+        Returns:
+            Float32 matrix of embedding vectors
+        """
+        for retry in range(self.max_retries):
+            try:
+                async with self._semaphore:
+                    start_time = time.perf_counter()
+                    embeddings = await self._call_model(batch_texts)
+                    elapsed = time.perf_counter() - start_time
+                
+                # Extract the embedding values
+                embedding_values = np.asarray([emb.values for emb in embeddings], dtype=np.float32)
+                self._adapt_batch_size(elapsed, len(batch_texts))
+                return embedding_values
+            except Exception as e:
+                # A grown batch may exceed API limits; retry at the configured size
+                if len(batch_texts) > self.batch_size:
+                    logger.warning("Embedding API error, retrying in batches of %d: %s", self.batch_size, e)
+                    self._reset_batch_size()
+                    parts = await asyncio.gather(*[
+                        self._embed_batch(batch_texts[j:j+self.batch_size])
+                        for j in range(0, len(batch_texts), self.batch_size)
+                    ])
+                    return np.vstack(parts)
+                
+                if retry < self.max_retries - 1:
+                    logger.warning("Embedding API error (retry %d/%d): %s", retry + 1, self.max_retries, e)
+                    await asyncio.sleep(self.retry_delay)
+                else:
+                    logger.error("Failed to generate embeddings after %d retries: %s", self.max_retries, e)
+                    raise
+    
+    async def _call_model(self, batch_texts: List[str]):
+        """
+        Call the embedding model asynchronously
+        
+        Uses the model's native async API when it has one and otherwise runs
+        the blocking call in the loop's default executor.
+        
+        Args:
+            batch_texts: Texts for a single API call
+            
+        Returns:
+            Embedding objects with a values attribute
+        """
+        model = self.model
+        if hasattr(model, "get_embeddings_async"):
+            return await model.get_embeddings_async(batch_texts)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, model.get_embeddings, batch_texts)
+    
+    def _adapt_batch_size(self, elapsed: float, num_texts: int) -> None:
+        """
+        Grow or shrink the batch size based on per-text API latency
+        
+        The batch size grows by 25% while the moving average of latency per
+        text keeps improving and shrinks by 25% when it gets worse.
+        
+        Args:
+            elapsed: Duration of the API call in seconds
+            num_texts: Number of texts in the call
+        """
+        with self._batch_lock:
+            per_text = elapsed / num_texts
+            previous = self._latency_ewma
+            if previous is None:
+                self._latency_ewma = per_text
+                return
+            
+            self._latency_ewma = _LATENCY_EWMA_ALPHA * per_text + (1 - _LATENCY_EWMA_ALPHA) * previous
+            if self._latency_ewma < previous:
+                grown = max(self._effective_batch_size + 1, int(self._effective_batch_size * 1.25))
+                self._effective_batch_size = min(grown, self.max_batch_size)
+            elif self._latency_ewma > previous:
+                self._effective_batch_size = max(1, int(self._effective_batch_size * 0.75))
+    
+    def _reset_batch_size(self) -> None:
+        """Return to the configured batch size after a failed call"""
+        with self._batch_lock:
+            self._effective_batch_size = self.batch_size
+            self._latency_ewma = None
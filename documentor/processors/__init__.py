@@ -3,6 +3,7 @@ Document processors for extracting text from various file formats.
 """
 
 import os
+import functools
 from typing import Dict, Type
 
 from documentor.processors.base import DocumentProcessor
@@ -26,12 +27,32 @@ def register_processor(extension: str, processor_class: Type[DocumentProcessor])
     """
     _PROCESSORS[extension.lower()] = processor_class
 
-def get_processor_for_file(file_path: str) -> DocumentProcessor:
+@functools.lru_cache(maxsize=None)
+def _get_processor(processor_class: Type[DocumentProcessor], use_ocr: bool = False) -> DocumentProcessor:
+    """
+    Get the shared processor instance for a processor class
+    
+    Args:
+        processor_class: Document processor class
+        use_ocr: Whether the instance should use OCR (PDF processors only)
+        
+    Returns:
+        Cached processor instance
+    """
+    if use_ocr:
+        return processor_class(use_ocr=True)
+    return processor_class()
+
+def get_processor_for_file(file_path: str, use_ocr: bool = False) -> DocumentProcessor:
     """
     Get the appropriate processor for a file
     
+    Processors are shared: one instance is created per processor class (plus
+    a separate OCR-enabled PDF processor), so callers must not modify them.
+    
     Args:
         file_path: Path to the file
+        use_ocr: Whether to use OCR for PDF text extraction
         
     Returns:
         DocumentProcessor instance for the file type
@@ -42,11 +63,21 @@ def get_processor_for_file(file_path: str) -> DocumentProcessor:
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext in _PROCESSORS:
-        return _PROCESSORS[ext]()
+        processor_class = _PROCESSORS[ext]
+        return _get_processor(processor_class, use_ocr and issubclass(processor_class, PDFProcessor))
     
     supported = ', '.join(_PROCESSORS.keys())
     raise ValueError(f"Unsupported file type: {ext}. Supported types: {supported}")
 
+def get_registered_processors() -> Dict[str, Type[DocumentProcessor]]:
+    """
+    Get a copy of the processor registry
+    
+    Returns:
+        Dictionary mapping file extensions to processor classes
+    """
+    return dict(_PROCESSORS)
+
 def get_supported_extensions() -> list:
     """
     Get a list of supported file extensions
@@ -62,5 +93,6 @@ __all__ = [
     'DocxProcessor',
     'register_processor',
     'get_processor_for_file',
+    'get_registered_processors',
     'get_supported_extensions',
 ]
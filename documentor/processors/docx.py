@@ -2,6 +2,8 @@
 Word document processor.
 """
 
+from itertools import chain
+
 from docx import Document
 from documentor.config import logger
 from documentor.processors.base import DocumentProcessor
@@ -22,15 +24,14 @@ class DocxProcessor(DocumentProcessor):
         """
         try:
             doc = Document(file_path)
-            paragraphs = [paragraph.text for paragraph in doc.paragraphs if paragraph.text]
+            
+            # Each .text access walks the XML tree, so read it once per element
+            paragraphs = (text for text in (paragraph.text for paragraph in doc.paragraphs) if text)
             
             # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        paragraphs.append(cell.text)
+            cells = (cell.text for table in doc.tables for row in table.rows for cell in row.cells)
             
-            return "\n".join(paragraphs)
+            return "\n".join(chain(paragraphs, cells))
         except Exception as e:
-            logger.error(f"Error extracting text from DOCX {file_path}: {str(e)}")
+            logger.error("Error extracting text from DOCX %s: %s", file_path, e)
             return ""
@@ -4,6 +4,15 @@ Vector storage implementations.
 
 from documentor.storage.base import VectorStore
 from documentor.storage.local import LocalVectorStore
-from documentor.storage.vertex import VertexMatchingEngineStore
+from documentor.storage.batching import BatchingSearcher
 
-__all__ = ['VectorStore', 'LocalVectorStore', 'VertexMatchingEngineStore']
+__all__ = ['VectorStore', 'LocalVectorStore', 'VertexMatchingEngineStore', 'BatchingSearcher']
+
+
+def __getattr__(name):
+    # The Matching Engine store pulls in the Cloud Storage and aiplatform
+    # clients, so it is only imported when first accessed
+    if name == 'VertexMatchingEngineStore':
+        from documentor.storage.vertex import VertexMatchingEngineStore
+        return VertexMatchingEngineStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,55 @@
+"""
+JSON serialization for the vector stores, using orjson when it is installed.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert values JSON has no type for (numpy arrays and scalars, anything else as a string)"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def dump_json(obj: Any) -> bytes:
+    """
+    Serialize to JSON bytes
+    
+    Args:
+        obj: Object to serialize (may contain numpy arrays)
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default).encode("utf-8")
+
+
+def load_json(data: Any) -> Any:
+    """
+    Parse JSON
+    
+    Args:
+        data: JSON text as bytes or str
+        
+    Returns:
+        Parsed object
+        
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,7 +2,9 @@
 Base vector store class.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
 
 
 class VectorStore:
@@ -10,14 +12,14 @@ class VectorStore:
     
     def add_embeddings(
         self, 
-        embeddings: List[List[float]], 
+        embeddings: Union[np.ndarray, List[List[float]]], 
         metadata: List[Dict[str, Any]]
     ) -> None:
         """
         Add embeddings to the store
         
         Args:
-            embeddings: List of embedding vectors
+            embeddings: Matrix of embedding vectors (one row per embedding)
             metadata: List of metadata dictionaries (one per embedding)
             
         Raises:
@@ -27,7 +29,7 @@ class VectorStore:
     
     def search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: Union[np.ndarray, List[float]], 
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -46,3 +48,25 @@ class VectorStore:
             NotImplementedError: If not implemented by subclass
         """
         raise NotImplementedError("Subclasses must implement search")
+    
+    def search_batch(
+        self, 
+        query_embeddings: Union[np.ndarray, List[List[float]]], 
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for the vectors most similar to each of several queries
+        
+        Subclasses can override this to answer all queries at once; by
+        default each query is searched separately.
+        
+        Args:
+            query_embeddings: Matrix of query embedding vectors (one row per query)
+            top_k: Number of results to return per query
+            filters: Dictionary of metadata fields to filter on (applied to every query)
+            
+        Returns:
+            List of search results (metadata dictionaries) for each query
+        """
+        return [self.search(query, top_k=top_k, filters=filters) for query in query_embeddings]
@@ -0,0 +1,84 @@
+"""
+Request coalescing for vector store searches.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+from documentor.config import logger, DEFAULT_SEARCH_MAX_BATCH, DEFAULT_SEARCH_MAX_WAIT_MS
+from documentor.storage.base import VectorStore
+from documentor._batching import MicroBatcher, Pending
+
+
+class BatchingSearcher(MicroBatcher):
+    """
+    Wrapper that coalesces concurrent searches into batched store lookups
+
+    Callers on any thread submit a query and block until its results are
+    ready. A background thread collects pending queries until max_batch are
+    queued or max_wait_ms has passed, then answers all queries that share the
+    same top_k and filters with a single search_batch call, so a remote store
+    such as Matching Engine handles them in one request.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        max_batch: int = DEFAULT_SEARCH_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_SEARCH_MAX_WAIT_MS,
+        max_concurrency: int = 1
+    ):
+        """
+        Initialize the batching searcher
+
+        Args:
+            store: Vector store to search
+            max_batch: Number of queries after which a batch is sent immediately
+            max_wait_ms: Maximum time to wait for more queries before sending a batch
+            max_concurrency: Maximum number of batches being searched at once
+        """
+        super().__init__(max_batch, max_wait_ms, max_concurrency, thread_name="search-batcher")
+        self.store = store
+
+    def search(
+        self,
+        query_embedding: Union[np.ndarray, List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar vectors
+
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of results to return
+            filters: Dictionary of metadata fields to filter on
+
+        Returns:
+            List of metadata dictionaries for the most similar vectors
+        """
+        return self._submit((query_embedding, top_k, filters))
+
+    def _group(self, pending: Pending) -> List[Pending]:
+        # Only queries with the same parameters can share a request
+        groups: Dict[Tuple, Pending] = {}
+        for item in pending:
+            (_, top_k, filters), _ = item
+            key = (top_k, tuple(sorted((k, repr(v)) for k, v in (filters or {}).items())))
+            groups.setdefault(key, []).append(item)
+        return list(groups.values())
+
+    def _flush(self, pending: Pending) -> None:
+        """
+        Search a batch of queries with the same parameters and resolve their futures
+
+        Args:
+            pending: List of ((query_embedding, top_k, filters), future) requests
+        """
+        (_, top_k, filters), _ = pending[0]
+        logger.debug("Searching %d coalesced queries", len(pending))
+
+        queries = np.stack([np.asarray(query, dtype=np.float32) for (query, _, _), _ in pending])
+        results = self.store.search_batch(queries, top_k=top_k, filters=filters)
+        self._resolve(pending, results)
@@ -4,51 +4,239 @@ Local vector store implementation.
 
 import os
 import pickle
+import threading
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 from documentor.config import logger
 from documentor.storage.base import VectorStore
+from documentor.storage._json import dump_json, load_json, _default
+from documentor.storage._kernels import normalize, encode_int8, select_topk, topk_cosine, topk_int8
+
+# Smallest number of rows allocated for the embedding matrix
+_MIN_CAPACITY = 1024
+
+# Search backends: brute-force numpy/numba scan, exact FAISS index, approximate HNSW graph
+_BACKENDS = ("numpy", "faiss_flat", "faiss_hnsw")
+
+# Below this many embeddings a scan is faster than building a FAISS index
+_FAISS_MIN_SIZE = 10000
+
+# HNSW graph parameters (neighbors per node, candidate list sizes when building and searching)
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 200
+_HNSW_EF_SEARCH = 128
+
+# Candidates fetched from the pq4 index per requested result, re-ranked exactly
+_PQ_RERANK = 8
+
+# Maximum number of similarities held in memory at once by search_batch
+_BATCH_SIMILARITY_SIZE = 1 << 24
 
 
 class LocalVectorStore(VectorStore):
-    """Simple local vector store using numpy"""
+    """
+    Simple local vector store using numpy
+    
+    Embeddings are normalized to unit length when they are added (their
+    original norms are kept alongside), so cosine similarity is a plain dot
+    product with the normalized query.
     
-    def __init__(self, store_path: Optional[str] = None):
+    Float32 is the store's only precision, as it is for the Vertex AI
+    embeddings and FAISS: embeddings, queries and loaded matrices of any other
+    dtype are converted once on the way in, so searches never scan (or copy)
+    a float64 matrix.
+    
+    A store saved at ``store_path`` consists of three files: ``<store_path>.npy``
+    holding the unit-length embeddings as a float32 matrix (memory-mapped on
+    load), ``<store_path>.norms.npy`` holding their original norms and
+    ``<store_path>.meta.jsonl`` holding one metadata dictionary per line.
+    When msgpack is installed new stores save their metadata as a sequence
+    of msgpack maps in ``<store_path>.meta.msgpack`` instead, which is smaller
+    and faster to decode. An existing store keeps the format it was created
+    with; opening a msgpack store without msgpack installed raises ImportError.
+    
+    With ``quantize="int8"`` searches scan an in-memory int8 copy of the
+    normalized embeddings (see encode_int8) instead of the float32 matrix,
+    trading a little similarity precision for a quarter of the memory traffic.
+    With ``quantize="pq4"`` (requires faiss) unfiltered searches use a 4-bit
+    product-quantized FAISS fast-scan index, a sixteenth of the size of the
+    float32 matrix; the best candidates are then re-scored exactly.
+    
+    Embeddings are kept in a preallocated float32 matrix whose capacity grows
+    geometrically, so adding embeddings is amortized O(rows added) and searches
+    never rebuild the matrix.
+    
+    The first search filtering on a metadata field builds an inverted index of
+    that field (value -> rows), which is kept up to date as embeddings are
+    added, so later filters on it don't scan the metadata.
+    
+    With a FAISS backend (requires the faiss package) unfiltered searches on
+    stores of at least 10,000 embeddings use a FAISS index instead of a full
+    scan: ``"faiss_flat"`` is exact, ``"faiss_hnsw"`` is an approximate HNSW
+    graph with sub-linear search time, saved as ``<store_path>.faiss``. The
+    index is built from the stored embeddings on the first such search.
+    The pq4 index follows the same rules and is saved the same way.
+    Filtered searches and small stores are always scanned.
+    """
+    
+    encode_int8 = staticmethod(encode_int8)
+    
+    def __init__(
+        self,
+        store_path: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "numpy"
+    ):
         """
         Initialize the local vector store
         
         Args:
             store_path: Path to save/load the store (None for in-memory only)
+            quantize: Quantization used for searching (None, "int8" or "pq4")
+            backend: Search backend (numpy, faiss_flat or faiss_hnsw)
+            
+        Raises:
+            ValueError: If the quantization type or backend is not supported
         """
+        if quantize not in (None, "int8", "pq4"):
+            raise ValueError(f"Unsupported quantization: {quantize}. Supported: int8, pq4")
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}. Supported: {', '.join(_BACKENDS)}")
+        if quantize == "pq4" and backend == "faiss_hnsw":
+            raise ValueError("pq4 quantization can't be combined with the faiss_hnsw backend")
+        if faiss is None and (backend != "numpy" or quantize == "pq4"):
+            logger.warning(
+                "%s requested but faiss is not installed, searching with numpy. "
+                "Install with: pip install faiss-cpu",
+                quantize if quantize == "pq4" else backend
+            )
+            backend = "numpy"
+            quantize = None if quantize == "pq4" else quantize
+        
         self.store_path = store_path
-        self.embeddings = []
+        self.quantize = quantize
+        self.backend = backend
         self.metadata = []
+        self._lock = threading.Lock()
+        # "msgpack" or "jsonl", chosen when the store is first saved or loaded
+        self._metadata_format: Optional[str] = None
+        self._reset()
         
-        if store_path and os.path.exists(store_path):
+        if store_path and self.exists(store_path):
             self._load()
     
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Float32 matrix of the stored unit-length embeddings (a view, one row per embedding)"""
+        return self._mat[:self._n]
+    
+    def _reset(self) -> None:
+        """Empty the embedding buffers"""
+        self._mat = np.empty((0, 0), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._codes = np.empty((0, 0), dtype=np.int8)
+        self._scales = np.empty(0, dtype=np.float16)
+        self._n = 0
+        self._cap = 0
+        self._filter_index: Dict[str, Optional[Dict[Any, List[int]]]] = {}
+        self._index = None
+    
+    def _reserve(self, size: int, dim: int) -> None:
+        """
+        Make room for at least ``size`` embeddings of dimension ``dim``
+        
+        Args:
+            size: Number of rows needed
+            dim: Embedding dimension
+            
+        Raises:
+            ValueError: If dim differs from the dimension of the stored embeddings
+        """
+        if self._n and dim != self._mat.shape[1]:
+            raise ValueError(f"Embedding dimension {dim} does not match the store's dimension {self._mat.shape[1]}")
+        if size <= self._cap and dim == self._mat.shape[1]:
+            return
+        
+        # Grow geometrically so repeated adds copy each row O(1) times on average
+        capacity = max(size, 2 * self._cap, _MIN_CAPACITY)
+        n = self._n
+        
+        mat = np.empty((capacity, dim), dtype=np.float32)
+        norms = np.empty(capacity, dtype=np.float32)
+        if n:
+            mat[:n] = self._mat[:n]
+            norms[:n] = self._norms[:n]
+        self._mat, self._norms = mat, norms
+        
+        if self.quantize == "int8":
+            codes = np.empty((capacity, dim), dtype=np.int8)
+            scales = np.empty(capacity, dtype=np.float16)
+            if n:
+                codes[:n] = self._codes[:n]
+                scales[:n] = self._scales[:n]
+            self._codes, self._scales = codes, scales
+        
+        self._cap = capacity
+    
+    @staticmethod
+    def exists(store_path: str) -> bool:
+        """
+        Check whether a saved store exists
+        
+        Args:
+            store_path: Path the store was saved to
+            
+        Returns:
+            True if the store (or a legacy pickle store) exists
+        """
+        return os.path.exists(store_path + ".npy") or _is_legacy_store(store_path)
+    
     def add_embeddings(
         self, 
-        embeddings: List[List[float]], 
+        embeddings: Union[np.ndarray, List[List[float]]], 
         metadata: List[Dict[str, Any]]
     ) -> None:
         """
         Add embeddings to the store
         
         Args:
-            embeddings: List of embedding vectors
+            embeddings: Matrix of embedding vectors (one row per embedding)
             metadata: List of metadata dictionaries (one per embedding)
         """
-        self.embeddings.extend(embeddings)
-        self.metadata.extend(metadata)
+        new_embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not len(new_embeddings):
+            return
         
-        if self.store_path:
-            self._save()
+        # Files are processed on several threads, which all add to the same store
+        with self._lock:
+            start, stop = self._n, self._n + len(new_embeddings)
+            self._reserve(stop, new_embeddings.shape[1])
+            self._mat[start:stop], self._norms[start:stop] = normalize(new_embeddings)
+            
+            if self.quantize == "int8":
+                self._codes[start:stop], self._scales[start:stop] = encode_int8(self._mat[start:stop])
+            
+            self._n = stop
+            self.metadata.extend(metadata)
+            self._update_filter_index(metadata, start)
+            
+            if self.store_path:
+                self._save()
     
     def search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: Union[np.ndarray, List[float]], 
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -63,70 +251,393 @@ class LocalVectorStore(VectorStore):
         Returns:
             List of metadata dictionaries for the most similar vectors
         """
-        if not self.embeddings:
-            return []
+        query_np = np.asarray(query_embedding, dtype=np.float32)
         
-        # Convert to numpy for faster computation
-        query_np = np.array(query_embedding)
-        embeddings_np = np.array(self.embeddings)
+        with self._lock:
+            n = self._n
+            if not n:
+                return []
+            
+            if self._uses_index() and not filters and n >= _FAISS_MIN_SIZE:
+                top_indices, top_similarity = self._search_index(query_np.reshape(1, -1), top_k)[0]
+                return self._results(top_indices, top_similarity)
+            
+            # Rows below n are never modified, so these views stay valid after the lock is released
+            matrix, codes, scales = self._mat[:n], self._codes[:n], self._scales[:n]
+            mask = self._mask(filters)
+        
+        if self.quantize == "int8":
+            top_indices, top_similarity = topk_int8(codes, scales, query_np, mask, top_k)
+        else:
+            top_indices, top_similarity = topk_cosine(matrix, query_np, mask, top_k)
         
-        # Compute cosine similarity
-        dot_product = np.dot(embeddings_np, query_np)
-        norm_query = np.linalg.norm(query_np)
-        norm_embeddings = np.linalg.norm(embeddings_np, axis=1)
+        return self._results(top_indices, top_similarity)
+    
+    def search_batch(
+        self, 
+        query_embeddings: Union[np.ndarray, List[List[float]]], 
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for the vectors most similar to each of several queries
         
-        similarity = dot_product / (norm_query * norm_embeddings)
+        The similarities of all queries are computed with one matrix-matrix
+        product (or one FAISS search) rather than one pass over the store per query.
         
-        # Apply filters if provided
-        if filters:
-            mask = np.ones(len(self.metadata), dtype=bool)
-            for key, value in filters.items():
-                for i, meta in enumerate(self.metadata):
-                    if key not in meta or meta[key] != value:
-                        mask[i] = False
+        Args:
+            query_embeddings: Matrix of query embedding vectors (one row per query)
+            top_k: Number of results to return per query
+            filters: Dictionary of metadata fields to filter on (applied to every query)
             
-            # Apply mask to similarity scores
-            filtered_similarity = np.where(mask, similarity, -np.inf)
-        else:
-            filtered_similarity = similarity
-        
-        # Get top-k indices (ignoring -inf values from filtering)
-        valid_indices = np.where(filtered_similarity != -np.inf)[0]
-        if len(valid_indices) == 0:
+        Returns:
+            List of search results (metadata dictionaries) for each query
+        """
+        if not len(query_embeddings):
             return []
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        
+        with self._lock:
+            n = self._n
+            if not n:
+                return [[] for _ in queries]
+            
+            if self._uses_index() and not filters and n >= _FAISS_MIN_SIZE:
+                return [self._results(*top) for top in self._search_index(queries, top_k)]
             
-        top_indices = valid_indices[np.argsort(filtered_similarity[valid_indices])[-top_k:][::-1]]
+            matrix, codes, scales = self._mat[:n], self._codes[:n], self._scales[:n]
+            mask = self._mask(filters)
         
-        # Return metadata with similarity scores
+        if self.quantize == "int8":
+            # A matrix product would need the codes widened to a larger type; scan per query instead
+            return [self._results(*topk_int8(codes, scales, query, mask, top_k)) for query in queries]
+        
+        queries, _ = normalize(queries)
         results = []
-        for idx in top_indices:
-            # Skip results with -inf similarity (filtered out)
-            if filtered_similarity[idx] == -np.inf:
-                continue
-                
+        step = max(1, _BATCH_SIMILARITY_SIZE // n)
+        for start in range(0, len(queries), step):
+            similarity = queries[start:start+step] @ matrix.T
+            for row in similarity:
+                results.append(self._results(*select_topk(row, mask, top_k)))
+        return results
+    
+    def _mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Find the rows that match all filters (caller must hold the lock)
+        
+        Args:
+            filters: Dictionary of metadata fields to filter on
+            
+        Returns:
+            Boolean array (n,) of matching rows, or None without filters
+        """
+        if not filters:
+            return None
+        
+        mask = None
+        for key, value in filters.items():
+            rows = self._filter_mask(key, value)
+            mask = rows if mask is None else mask & rows
+        return mask
+    
+    def _results(self, top_indices: np.ndarray, top_similarity: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Build search results from the selected rows
+        
+        Args:
+            top_indices: Row numbers of the results
+            top_similarity: Similarity of each result
+            
+        Returns:
+            List of metadata dictionaries with a "similarity" score added
+        """
+        results = []
+        for idx, score in zip(top_indices, top_similarity):
             result = self.metadata[idx].copy()
-            result["similarity"] = float(similarity[idx])
+            result["similarity"] = float(score)
             results.append(result)
             
         return results
     
+    def _uses_index(self) -> bool:
+        """Whether unfiltered searches on large stores go through a FAISS index"""
+        return self.backend != "numpy" or self.quantize == "pq4"
+    
+    def _saves_index(self) -> bool:
+        """Whether the FAISS index is too costly to rebuild and is saved with the store"""
+        return self.backend == "faiss_hnsw" or self.quantize == "pq4"
+    
+    def _search_index(self, queries: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Search the FAISS index, first adding any embeddings it doesn't hold yet
+        (caller must hold the lock)
+        
+        Args:
+            queries: Matrix of query embedding vectors (one row per query)
+            top_k: Number of results to return per query
+            
+        Returns:
+            Tuple of (indices, similarities) sorted by descending similarity for each query
+        """
+        if self._index is None:
+            dim = self._mat.shape[1]
+            if self.quantize == "pq4":
+                # Two dimensions per 4-bit sub-quantizer; scanned with SIMD lookup tables
+                subquantizers = dim // 2 if dim % 2 == 0 else dim
+                self._index = faiss.IndexPQFastScan(dim, subquantizers, 4, faiss.METRIC_INNER_PRODUCT)
+                self._index.train(np.ascontiguousarray(self._mat[:self._n]))
+            elif self.backend == "faiss_hnsw":
+                self._index = faiss.IndexHNSWFlat(dim, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+                self._index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+                self._index.hnsw.efSearch = _HNSW_EF_SEARCH
+            else:
+                self._index = faiss.IndexFlatIP(dim)
+        
+        if self._index.ntotal < self._n:
+            self._index.add(np.ascontiguousarray(self._mat[self._index.ntotal:self._n]))
+        
+        if top_k <= 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in queries]
+        
+        queries, _ = normalize(queries)
+        if self.quantize != "pq4":
+            similarity, indices = self._index.search(queries, min(top_k, self._n))
+            return [(ids[ids >= 0], scores[ids >= 0]) for ids, scores in zip(indices, similarity)]
+        
+        # PQ distances are coarse; rescore a few times more candidates against the full vectors
+        _, indices = self._index.search(queries, min(top_k * _PQ_RERANK, self._n))
+        results = []
+        for query, ids in zip(queries, indices):
+            candidates = ids[ids >= 0]
+            similarity = self._mat[candidates] @ query
+            order = np.argsort(-similarity)[:top_k]
+            results.append((candidates[order], similarity[order]))
+        return results
+    
+    def _filter_mask(self, key: str, value: Any) -> np.ndarray:
+        """
+        Find the rows whose metadata field equals a value (caller must hold the lock)
+        
+        Args:
+            key: Metadata field
+            value: Value the field must have
+            
+        Returns:
+            Boolean array (n,) of matching rows
+        """
+        if key not in self._filter_index:
+            self._filter_index[key] = self._build_filter_index(key)
+        index = self._filter_index[key]
+        
+        if index is not None:
+            try:
+                rows = index.get(value, [])
+            except TypeError:
+                pass
+            else:
+                mask = np.zeros(self._n, dtype=bool)
+                mask[rows] = True
+                return mask
+        
+        # Unhashable values can't be indexed; compare against every row
+        return np.fromiter(
+            (key in meta and meta[key] == value for meta in self.metadata),
+            dtype=bool, count=self._n
+        )
+    
+    def _build_filter_index(self, key: str) -> Optional[Dict[Any, List[int]]]:
+        """
+        Build the inverted index of a metadata field
+        
+        Args:
+            key: Metadata field
+            
+        Returns:
+            Dictionary mapping each value of the field to its rows, or None if
+            some value is unhashable
+        """
+        index: Dict[Any, List[int]] = {}
+        try:
+            for i, meta in enumerate(self.metadata):
+                if key in meta:
+                    index.setdefault(meta[key], []).append(i)
+        except TypeError:
+            return None
+        return index
+    
+    def _update_filter_index(self, metadata: List[Dict[str, Any]], start: int) -> None:
+        """
+        Add new rows to the inverted indexes built so far
+        
+        Args:
+            metadata: Metadata of the new rows
+            start: Row number of the first new row
+        """
+        for key, index in self._filter_index.items():
+            if index is None:
+                continue
+            try:
+                for i, meta in enumerate(metadata, start):
+                    if key in meta:
+                        index.setdefault(meta[key], []).append(i)
+            except TypeError:
+                self._filter_index[key] = None
+    
     def _save(self) -> None:
         """Save the store to disk"""
+        vectors_path = self.store_path + ".npy"
+        norms_path = self.store_path + ".norms.npy"
+        if self._metadata_format is None:
+            self._metadata_format = "msgpack" if msgpack is not None else "jsonl"
+        metadata_path = self.store_path + ".meta." + self._metadata_format
         try:
-            with open(self.store_path, 'wb') as f:
-                pickle.dump((self.embeddings, self.metadata), f)
-            logger.debug(f"Vector store saved to {self.store_path}")
+            # Write to temporary files first so a failed save can't leave
+            # the vectors and metadata out of sync
+            with open(vectors_path + ".tmp", 'wb') as f:
+                np.save(f, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+            with open(norms_path + ".tmp", 'wb') as f:
+                np.save(f, np.ascontiguousarray(self._norms[:self._n], dtype=np.float32))
+            with open(metadata_path + ".tmp", 'wb') as f:
+                if self._metadata_format == "msgpack":
+                    packer = msgpack.Packer(default=_default, use_bin_type=True)
+                    for meta in self.metadata:
+                        f.write(packer.pack(meta))
+                else:
+                    for meta in self.metadata:
+                        f.write(dump_json(meta))
+                        f.write(b"\n")
+            os.replace(norms_path + ".tmp", norms_path)
+            os.replace(vectors_path + ".tmp", vectors_path)
+            os.replace(metadata_path + ".tmp", metadata_path)
+            
+            # A flat index is rebuilt from the vectors cheaply; HNSW and PQ indexes are not
+            if self._saves_index() and self._index is not None:
+                faiss.write_index(self._index, self.store_path + ".faiss.tmp")
+                os.replace(self.store_path + ".faiss.tmp", self.store_path + ".faiss")
+            logger.debug("Vector store saved to %s", self.store_path)
         except Exception as e:
-            logger.error(f"Error saving vector store: {str(e)}")
+            logger.error("Error saving vector store: %s", e)
     
     def _load(self) -> None:
-        """Load the store from disk"""
+        """
+        Load the store from disk
+        
+        Stores in an older format are converted in memory only; the files are
+        rewritten in the current format by the next add_embeddings, so opening
+        a store to read it (e.g. the info command) never changes it on disk.
+        """
         try:
-            with open(self.store_path, 'rb') as f:
-                self.embeddings, self.metadata = pickle.load(f)
-            logger.debug(f"Vector store loaded from {self.store_path} with {len(self.embeddings)} embeddings")
+            if os.path.exists(self.store_path + ".npy"):
+                self.metadata = self._load_metadata()
+                if os.path.exists(self.store_path + ".norms.npy"):
+                    # Pages are read on demand and shared between processes; the
+                    # matrix is copied into a growable buffer on the first add
+                    self._set_embeddings(
+                        np.load(self.store_path + ".npy", mmap_mode='r'),
+                        np.load(self.store_path + ".norms.npy", mmap_mode='r')
+                    )
+                    self._load_index()
+                else:
+                    # Saved before embeddings were normalized on insert
+                    self._set_embeddings(np.load(self.store_path + ".npy"))
+            else:
+                self._load_legacy()
+            logger.debug("Vector store loaded from %s with %d embeddings", self.store_path, self._n)
         except Exception as e:
-            logger.error(f"Error loading vector store: {str(e)}")
-            # Initialize empty store on error
-            self.embeddings = []
-            self.metadata = []
+            # Starting empty would overwrite the saved store on the next add
+            logger.error("Error loading vector store %s: %s", self.store_path, e)
+            raise
+    
+    def _load_index(self) -> None:
+        """Load the saved HNSW or PQ index, if it matches the loaded embeddings"""
+        index_path = self.store_path + ".faiss"
+        if not self._saves_index() or not self._n or not os.path.exists(index_path):
+            return
+        
+        try:
+            index = faiss.read_index(index_path)
+        except Exception as e:
+            logger.warning("Could not load FAISS index %s, it will be rebuilt: %s", index_path, e)
+            return
+        
+        # Embeddings are only ever appended, so an index of a prefix of them is still valid
+        expected = faiss.IndexPQFastScan if self.quantize == "pq4" else faiss.IndexHNSWFlat
+        if isinstance(index, expected) and index.d == self._mat.shape[1] and index.ntotal <= self._n:
+            self._index = index
+    
+    def _load_metadata(self) -> List[Dict[str, Any]]:
+        """
+        Read the metadata saved alongside the embeddings
+        
+        Returns:
+            List of metadata dictionaries
+        """
+        msgpack_path = self.store_path + ".meta.msgpack"
+        if os.path.exists(msgpack_path):
+            if msgpack is None:
+                raise ImportError(
+                    f"{msgpack_path} was saved with msgpack, which is not installed. "
+                    "Install with: pip install msgpack"
+                )
+            self._metadata_format = "msgpack"
+            with open(msgpack_path, 'rb') as f:
+                return list(msgpack.Unpacker(f, raw=False, strict_map_key=False))
+        
+        metadata_path = self.store_path + ".meta.jsonl"
+        if not os.path.exists(metadata_path):
+            # Stores saved before metadata was line-delimited hold a single JSON list
+            with open(self.store_path + ".json", 'rb') as f:
+                return load_json(f.read())
+        
+        self._metadata_format = "jsonl"
+        with open(metadata_path, 'rb') as f:
+            return [load_json(line) for line in f if line.strip()]
+    
+    def _set_embeddings(self, embeddings: np.ndarray, norms: Optional[np.ndarray] = None) -> None:
+        """
+        Use a loaded matrix as the store's embeddings
+        
+        Args:
+            embeddings: Matrix of embedding vectors (may be memory-mapped)
+            norms: Original norms if the embeddings are already unit length
+                (None to normalize them here)
+        """
+        self._reset()
+        if not len(embeddings):
+            return
+        if embeddings.dtype != np.float32:
+            # Read into memory once rather than converting the matrix on every search
+            logger.info("Converting %s embeddings in %s to float32", embeddings.dtype, self.store_path)
+            embeddings = embeddings.astype(np.float32)
+        if norms is None:
+            embeddings, norms = normalize(embeddings)
+        self._mat = embeddings
+        self._norms = np.asarray(norms, dtype=np.float32)
+        if self.quantize == "int8":
+            self._codes, self._scales = encode_int8(embeddings)
+        self._n = self._cap = len(embeddings)
+    
+    def _load_legacy(self) -> None:
+        """Load a store saved in the old single-file pickle format"""
+        with open(self.store_path, 'rb') as f:
+            embeddings, self.metadata = pickle.load(f)
+        if embeddings:
+            self._set_embeddings(np.asarray(embeddings, dtype=np.float32))
+        logger.info("Loaded legacy vector store %s, it will be saved as .npy on the next add", self.store_path)
+
+
+def _is_legacy_store(store_path: str) -> bool:
+    """
+    Check whether a path holds a store saved in the old single-file pickle format
+    
+    Args:
+        store_path: Path the store was saved to
+        
+    Returns:
+        True if the path is a file starting with a pickle protocol header
+    """
+    try:
+        with open(store_path, 'rb') as f:
+            return f.read(1) == pickle.PROTO
+    except OSError:
+        return False
@@ -6,15 +6,53 @@ import os
 import json
 import uuid
 import tempfile
-from typing import List, Dict, Any, Optional
+import threading
+import concurrent.futures
+from typing import List, Dict, Any, Optional, Union
 
+import numpy as np
 from google.cloud import storage
 from google.cloud import aiplatform
 from google.cloud.aiplatform.matching_engine import MatchingEngineIndex
 from google.cloud.aiplatform.matching_engine import MatchingEngineIndexEndpoint
 
+try:
+    import fastavro
+except ImportError:
+    fastavro = None
+
 from documentor.config import logger, DEFAULT_LOCATION
 from documentor.storage.base import VectorStore
+from documentor.storage._json import dump_json, load_json
+
+# Resumable uploads send the file in pieces of this size (a multiple of 256 KB)
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Seconds to wait for each upload request
+_UPLOAD_TIMEOUT = 300
+
+# Embeddings per uploaded file, and number of files written and uploaded at once
+_SHARD_SIZE = 50000
+_MAX_CONCURRENT_UPLOADS = 8
+
+# Matching Engine input record, used when embeddings are uploaded as Avro
+_AVRO_SCHEMA = fastavro.parse_schema({
+    "type": "record",
+    "name": "Embedding",
+    "fields": [
+        {"name": "id", "type": "string"},
+        {"name": "embedding", "type": {"type": "array", "items": "float"}},
+        {"name": "restricts", "type": {"type": "array", "items": {
+            "type": "record",
+            "name": "Restrict",
+            "fields": [
+                {"name": "namespace", "type": "string"},
+                {"name": "allow", "type": {"type": "array", "items": "string"}}
+            ]
+        }}},
+        {"name": "metadata", "type": "string"}
+    ]
+}) if fastavro is not None else None
 
 
 class VertexMatchingEngineStore(VectorStore):
@@ -47,6 +85,12 @@ class VertexMatchingEngineStore(VectorStore):
         self.index_name = index_name
         self.dimensions = dimensions
         
+        # The Cloud Storage client and bucket handles are created on first
+        # upload and reused, as creating them involves auth and HTTP setup
+        self._storage_client: Optional[storage.Client] = None
+        self._buckets: Dict[str, storage.Bucket] = {}
+        self._storage_lock = threading.Lock()
+        
         # Initialize Vertex AI
         aiplatform.init(project=project_id, location=location)
         
@@ -196,71 +240,135 @@ class VertexMatchingEngineStore(VectorStore):
     
     def add_embeddings(
         self, 
-        embeddings: List[List[float]], 
+        embeddings: Union[np.ndarray, List[List[float]]], 
         metadata: List[Dict[str, Any]]
     ) -> None:
         """
         Add embeddings to the store
         
         Args:
-            embeddings: List of embedding vectors
+            embeddings: Matrix of embedding vectors (one row per embedding)
             metadata: List of metadata dictionaries (one per embedding)
             
         Raises:
             Exception: If adding embeddings fails
         """
-        if not embeddings:
+        if not len(embeddings):
             logger.warning("No embeddings to add")
             return
             
         try:
-            # Create a temporary jsonl file to upload
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
-                temp_file = f.name
-                for i, (emb, meta) in enumerate(zip(embeddings, metadata)):
-                    # Create ID for the vector
-                    vector_id = meta.get("id", str(uuid.uuid4()))
-                    
-                    # Extract restricts (filter fields) if any
-                    restricts = {}
-                    if "source" in meta:
-                        restricts["source"] = meta["source"]
-                    
-                    # Prepare the entry
-                    entry = {
-                        "id": vector_id,
-                        "embedding": emb,
-                        "restricts": restricts,
-                        "metadata": json.dumps(meta)  # Metadata must be string
-                    }
-                    
-                    # Write to jsonl file
-                    f.write(json.dumps(entry) + "\n")
-            
             # Upload to GCS
             logger.info(f"Uploading {len(embeddings)} embeddings to GCS")
             bucket_name = f"{self.project_id}-matching-engine"
             self._ensure_bucket_exists(bucket_name)
             
-            blob_name = f"uploads/{self.index_name}/{uuid.uuid4()}.jsonl"
-            self._upload_to_gcs(temp_file, bucket_name, blob_name)
+            # Each batch goes to its own directory, which the index update reads in full
+            upload_dir = f"uploads/{self.index_name}/{uuid.uuid4()}"
+            
+            # Large batches are split into shards that are written and uploaded
+            # concurrently, overlapping encoding with network transfers
+            shards = range(0, len(embeddings), _SHARD_SIZE)
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(shards), _MAX_CONCURRENT_UPLOADS)
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._upload_shard,
+                        embeddings[start:start+_SHARD_SIZE],
+                        metadata[start:start+_SHARD_SIZE],
+                        bucket_name,
+                        f"{upload_dir}/shard-{i:05d}"
+                    )
+                    for i, start in enumerate(shards)
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
             
             # Update the index with new vectors
             logger.info("Updating Matching Engine index with new embeddings")
             self.index.update_embeddings(
-                contents_delta_uri=f"gs://{bucket_name}/{blob_name}"
+                contents_delta_uri=f"gs://{bucket_name}/{upload_dir}/"
             )
             
-            # Clean up
-            os.unlink(temp_file)
             logger.info("Successfully added embeddings to Matching Engine")
         except Exception as e:
             logger.error(f"Error adding embeddings to Matching Engine: {str(e)}")
             raise
     
+    def _upload_shard(
+        self,
+        embeddings: Union[np.ndarray, List[List[float]]],
+        metadata: List[Dict[str, Any]],
+        bucket_name: str,
+        blob_prefix: str
+    ) -> None:
+        """
+        Write a shard of embeddings to a temporary file and upload it
+        
+        Args:
+            embeddings: Matrix of embedding vectors (one row per embedding)
+            metadata: List of metadata dictionaries (one per embedding)
+            bucket_name: Name of the bucket
+            blob_prefix: Blob name without the file extension
+        """
+        temp_file = self._write_embeddings_file(embeddings, metadata)
+        try:
+            self._upload_to_gcs(temp_file, bucket_name, blob_prefix + os.path.splitext(temp_file)[1])
+        finally:
+            # Clean up
+            os.unlink(temp_file)
+    
+    def _write_embeddings_file(
+        self,
+        embeddings: Union[np.ndarray, List[List[float]]],
+        metadata: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Write embeddings to a temporary file in a Matching Engine input format
+        
+        Binary Avro is used when fastavro is installed (smaller and faster to
+        encode than JSON floats); otherwise the file is JSON lines. Both hold
+        the same records, so the index filters the same way either way.
+        
+        Args:
+            embeddings: Matrix of embedding vectors (one row per embedding)
+            metadata: List of metadata dictionaries (one per embedding)
+            
+        Returns:
+            Path of the temporary file (.avro or .jsonl)
+        """
+        entries = (
+            {
+                # Create ID for the vector
+                "id": meta.get("id", str(uuid.uuid4())),
+                "embedding": np.asarray(emb, dtype=np.float32),
+                # Restricts (filter fields) in Matching Engine's documented list form
+                "restricts": [
+                    {"namespace": "source", "allow": [str(meta["source"])]}
+                ] if "source" in meta else [],
+                "metadata": dump_json(meta).decode("utf-8")  # Metadata must be string
+            }
+            for emb, meta in zip(embeddings, metadata)
+        )
+        
+        if fastavro is not None:
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.avro', delete=False) as f:
+                fastavro.writer(f, _AVRO_SCHEMA, (
+                    dict(entry, embedding=entry["embedding"].tolist())
+                    for entry in entries
+                ))
+                return f.name
+        
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.jsonl', delete=False) as f:
+            for entry in entries:
+                # Write to jsonl file
+                f.write(dump_json(entry) + b"\n")
+            return f.name
+    
     def search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: Union[np.ndarray, List[float]], 
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -278,6 +386,33 @@ class VertexMatchingEngineStore(VectorStore):
         Raises:
             Exception: If search fails
         """
+        return self.search_batch([query_embedding], top_k=top_k, filters=filters)[0]
+    
+    def search_batch(
+        self, 
+        query_embeddings: Union[np.ndarray, List[List[float]]], 
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for the vectors most similar to each of several queries
+        
+        All queries are sent to the index endpoint in a single request.
+        
+        Args:
+            query_embeddings: Matrix of query embedding vectors (one row per query)
+            top_k: Number of results to return per query
+            filters: Dictionary of metadata fields to filter on (applied to every query)
+            
+        Returns:
+            List of search results (metadata dictionaries) for each query
+            
+        Raises:
+            Exception: If search fails
+        """
+        if not len(query_embeddings):
+            return []
+        
         try:
             # Prepare filters if any
             filter_dict = {}
@@ -288,48 +423,70 @@ class VertexMatchingEngineStore(VectorStore):
             # Search the index
             response = self.endpoint.find_neighbors(
                 deployed_index_id=self.index_name,
-                queries=[query_embedding],
+                queries=np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)).tolist(),
                 num_neighbors=top_k,
                 filter=filter_dict if filter_dict else None
             )
             
-            # Process results
-            results = []
-            for neighbor in response[0]:
-                try:
-                    # Parse the metadata JSON
-                    result = json.loads(neighbor.metadata)
-                    result["similarity"] = float(neighbor.distance)
-                    results.append(result)
-                except json.JSONDecodeError:
-                    logger.warning(f"Could not parse metadata for result: {neighbor.metadata}")
-                    # Include minimal result
-                    results.append({
-                        "id": neighbor.id,
-                        "similarity": float(neighbor.distance),
-                        "metadata_raw": neighbor.metadata
-                    })
-                    
-            return results
+            return [self._parse_neighbors(neighbors) for neighbors in response]
         except Exception as e:
             logger.error(f"Error searching Matching Engine: {str(e)}")
             raise
     
-    def _ensure_bucket_exists(self, bucket_name: str) -> None:
+    def _parse_neighbors(self, neighbors) -> List[Dict[str, Any]]:
+        """
+        Convert the neighbors found for one query into search results
+        
+        Args:
+            neighbors: Neighbors returned by find_neighbors for the query
+            
+        Returns:
+            List of metadata dictionaries with a "similarity" score added
+        """
+        results = []
+        for neighbor in neighbors:
+            try:
+                # Parse the metadata JSON
+                result = load_json(neighbor.metadata)
+                result["similarity"] = float(neighbor.distance)
+                results.append(result)
+            except json.JSONDecodeError:
+                logger.warning(f"Could not parse metadata for result: {neighbor.metadata}")
+                # Include minimal result
+                results.append({
+                    "id": neighbor.id,
+                    "similarity": float(neighbor.distance),
+                    "metadata_raw": neighbor.metadata
+                })
+                
+        return results
+    
+    def _ensure_bucket_exists(self, bucket_name: str) -> storage.Bucket:
         """
         Ensure GCS bucket exists
         
         Args:
             bucket_name: Name of the bucket
+            
+        Returns:
+            Handle of the bucket (checked once per store instance)
         """
-        storage_client = storage.Client(project=self.project_id)
-        
-        try:
-            storage_client.get_bucket(bucket_name)
-            logger.debug(f"Using existing GCS bucket: {bucket_name}")
-        except Exception:
-            logger.info(f"Creating GCS bucket: {bucket_name}")
-            storage_client.create_bucket(bucket_name, location=self.location)
+        with self._storage_lock:
+            if bucket_name in self._buckets:
+                return self._buckets[bucket_name]
+            
+            if self._storage_client is None:
+                self._storage_client = storage.Client(project=self.project_id)
+            
+            try:
+                bucket = self._storage_client.get_bucket(bucket_name)
+                logger.debug(f"Using existing GCS bucket: {bucket_name}")
+            except Exception:
+                logger.info(f"Creating GCS bucket: {bucket_name}")
+                bucket = self._storage_client.create_bucket(bucket_name, location=self.location)
+            
+            self._buckets[bucket_name] = bucket
+            return bucket
     
     def _upload_to_gcs(
         self, 
@@ -345,8 +502,7 @@ class VertexMatchingEngineStore(VectorStore):
             bucket_name: Name of the bucket
             blob_name: Name of the blob
         """
-        storage_client = storage.Client(project=self.project_id)
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        blob.upload_from_filename(local_file)
+        bucket = self._ensure_bucket_exists(bucket_name)
+        blob = bucket.blob(blob_name, chunk_size=_UPLOAD_CHUNK_SIZE)
+        blob.upload_from_filename(local_file, timeout=_UPLOAD_TIMEOUT)
         logger.debug(f"Uploaded {local_file} to gs://{bucket_name}/{blob_name}")
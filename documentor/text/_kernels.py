@@ -0,0 +1,154 @@
+"""
+Chunking kernels for the text chunker.
+
+When numba is installed, the hybrid strategy's search for break points runs
+as a compiled loop over the text's code units instead of in Python. Text is
+passed as a uint8 array when it is ASCII and as UTF-32 code points (uint32)
+otherwise, so array offsets are always character offsets into the str.
+
+As with the search kernels, explicit signatures compile the kernel when this
+module is imported and cache=True keeps the machine code in __pycache__.
+numba compiles for the CPU it runs on, which is what a C extension built
+with -march=native would give, without a compiler at install time or
+wheels that only run on the build machine's CPU.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Break points tried by the hybrid strategy, most preferred first: a
+# paragraph break, a newline, the end of a sentence and a space. The
+# separators of each kind have the same length
+_BREAKS = [('\n\n',), ('\n',), ('. ', '! ', '? ', '.\n', '!\n', '?\n'), (' ',)]
+_BREAK_LENGTHS = np.array([len(separators[0]) for separators in _BREAKS], dtype=np.int64)
+
+# Class of each of the first 256 characters (0 for characters that are no
+# part of any separator), so a character is classified with one lookup
+_BREAK_CHARS = '\n .!?'
+_CHAR_CLASS = np.zeros(256, dtype=np.int64)
+for _i, _char in enumerate(_BREAK_CHARS):
+    _CHAR_CLASS[ord(_char)] = _i + 1
+
+# Kind of break formed by a character on its own and by a pair of
+# characters, indexed by class (-1 where there is none)
+_SINGLE_BREAK = np.full(len(_BREAK_CHARS) + 1, -1, dtype=np.int64)
+_PAIR_BREAK = np.full((len(_BREAK_CHARS) + 1, len(_BREAK_CHARS) + 1), -1, dtype=np.int64)
+for _i, _separators in enumerate(_BREAKS):
+    for _sep in _separators:
+        _classes = [_BREAK_CHARS.index(_char) + 1 for _char in _sep]
+        if len(_classes) == 1:
+            _SINGLE_BREAK[_classes[0]] = _i
+        else:
+            _PAIR_BREAK[_classes[0], _classes[1]] = _i
+
+
+def code_units(text: str) -> np.ndarray:
+    """
+    View a text as an array with one element per character
+
+    Args:
+        text: Text to convert
+
+    Returns:
+        uint8 array for ASCII text, uint32 array of code points otherwise
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+if NUMBA_AVAILABLE:
+    @njit(
+        [
+            types.int64[:, ::1](types.Array(unit, 1, 'C', readonly=True), types.int64, types.int64)
+            for unit in (types.uint8, types.uint32)
+        ],
+        cache=True
+    )
+    def _hybrid_spans(chars, chunk_size, overlap):
+        n = chars.shape[0]
+        half = chunk_size // 2
+        spans = np.empty((16, 2), dtype=np.int64)
+        count = 0
+
+        # Rightmost position of each kind of break in the window
+        num_kinds = _BREAK_LENGTHS.shape[0]
+        best = np.empty(num_kinds, dtype=np.int64)
+
+        start = 0
+        while start < n:
+            end = min(start + chunk_size, n)
+
+            if end < n:
+                best[:] = -1
+                for p in range(end - 1, start + half, -1):
+                    c = chars[p]
+                    cls = _CHAR_CLASS[c] if c < 256 else 0
+                    if cls == 0:
+                        continue
+
+                    if p + 1 < end:
+                        following = chars[p + 1]
+                        kind = _PAIR_BREAK[cls, _CHAR_CLASS[following] if following < 256 else 0]
+                        if kind == 0:
+                            # Nothing is preferred to a paragraph break
+                            best[0] = p
+                            break
+                        if kind > 0 and best[kind] < 0:
+                            best[kind] = p
+
+                    kind = _SINGLE_BREAK[cls]
+                    if kind >= 0 and best[kind] < 0:
+                        best[kind] = p
+
+                for kind in range(num_kinds):
+                    if best[kind] >= 0:
+                        end = best[kind] + _BREAK_LENGTHS[kind]
+                        break
+
+            if count == spans.shape[0]:
+                grown = np.empty((2 * count, 2), dtype=np.int64)
+                grown[:count] = spans
+                spans = grown
+            spans[count, 0] = start
+            spans[count, 1] = end
+            count += 1
+
+            # Move start position for next chunk, considering overlap, but
+            # always forward: start never drops below 0, so every index read
+            # above stays within [0, n)
+            start = max(end - overlap, start + 1)
+            if start >= end or end == n:
+                if end < n:
+                    start = end
+                else:
+                    break
+
+        return spans[:count].copy()
+
+
+def hybrid_spans(text: str, chunk_size: int, chunk_overlap: int) -> np.ndarray:
+    """
+    Find the chunks of the hybrid strategy (requires numba)
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum size of each chunk
+        chunk_overlap: Overlap between consecutive chunks
+
+    Returns:
+        int64 array (m, 2) of chunk start and end offsets
+
+    Raises:
+        ValueError: If chunk_size is not positive or chunk_overlap is negative
+    """
+    # The kernel does no bounds checking, so reject settings that could
+    # move a window outside the text
+    if chunk_size <= 0 or chunk_overlap < 0:
+        raise ValueError(f"Invalid chunk_size {chunk_size} or chunk_overlap {chunk_overlap}")
+    return _hybrid_spans(code_units(text), int(chunk_size), int(chunk_overlap))
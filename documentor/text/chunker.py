@@ -3,9 +3,94 @@ Text chunking functionality.
 """
 
 import re
-from typing import List
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
 
 from documentor.config import DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_OVERLAP
+from documentor.text._kernels import NUMBA_AVAILABLE, hybrid_spans
+
+# A sentence without its surrounding whitespace: everything up to a
+# terminator followed by whitespace (or up to the last non-space character)
+_SENTENCE_RE = re.compile(r'(?=\S)[^.!?]*(?:[.!?](?!\s)[^.!?]*)*(?:[.!?]|(?<!\s))')
+
+# Where the hybrid strategy may end a chunk at a sentence
+_SENTENCE_END_RE = re.compile(r'[.!?][ \n]')
+
+
+def _find_all(text: str, char: str) -> List[int]:
+    """
+    Find every position of a character with str.find (a C-level memchr scan)
+    
+    Args:
+        text: Text to scan
+        char: Character to look for
+        
+    Returns:
+        Sorted positions of the character
+    """
+    positions = []
+    i = text.find(char)
+    while i != -1:
+        positions.append(i)
+        i = text.find(char, i + 1)
+    return positions
+
+
+def _find_breaks(text: str) -> List[Tuple[int, List[int]]]:
+    """
+    Find every break point in a text
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        (separator length, sorted start positions) pairs for paragraph
+        breaks, newlines, sentence ends and spaces, in order of preference
+    """
+    newlines = _find_all(text, '\n')
+    return [
+        (2, [i for i in newlines if text.startswith('\n', i + 1)]),
+        (1, newlines),
+        (2, [match.start() for match in _SENTENCE_END_RE.finditer(text)]),
+        (1, _find_all(text, ' ')),
+    ]
+
+
+def _sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Find the sentences of a text without copying them
+    
+    Sentences are split at whitespace following '.', '!' or '?'.
+    
+    Args:
+        text: Text to split
+        
+    Yields:
+        (start, end) offsets of each non-empty sentence, stripped of whitespace
+    """
+    for match in _SENTENCE_RE.finditer(text):
+        yield match.span()
+
+
+def _advance(positions: List[int], limit: int, lo: int, step: int) -> int:
+    """
+    Count the positions not after a limit, resuming from an earlier count
+    
+    Args:
+        positions: Sorted positions
+        limit: Largest position to count
+        lo: Count for an earlier, smaller limit
+        step: Number of positions expected past lo, to bound the search
+        
+    Returns:
+        Number of positions not after the limit
+    """
+    hi = min(len(positions), lo + step)
+    count = bisect_right(positions, limit, lo, hi)
+    if count == hi:
+        # More than step positions fell under the limit
+        count = bisect_right(positions, limit, hi)
+    return count
 
 
 class TextChunker:
@@ -24,11 +109,38 @@ class TextChunker:
             chunk_size: Maximum size of each chunk
             chunk_overlap: Overlap between consecutive chunks
             strategy: Chunking strategy (hybrid, sentence, fixed)
+            
+        Raises:
+            ValueError: If chunk_size is not positive or chunk_overlap is
+                negative or not smaller than chunk_size
         """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError(
+                f"chunk_overlap must be at least 0 and less than chunk_size ({chunk_size}), got {chunk_overlap}"
+            )
+        
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.strategy = strategy
     
+    @property
+    def strategy(self) -> str:
+        """Chunking strategy (hybrid, sentence, fixed)"""
+        return self._strategy
+    
+    @strategy.setter
+    def strategy(self, strategy: str) -> None:
+        self._strategy = strategy
+        # Pick the strategy's method once rather than on every text
+        if strategy == "sentence":
+            self._chunk = self._chunk_by_sentence
+        elif strategy == "fixed":
+            self._chunk = self._chunk_fixed
+        else:  # Default to hybrid approach
+            self._chunk = self._chunk_hybrid
+    
     def chunk_text(self, text: str) -> List[str]:
         """
         Split text into chunks
@@ -39,163 +151,180 @@ class TextChunker:
         Returns:
             List of text chunks
         """
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """
+        Split text into chunks lazily, for callers that consume them once
+        
+        Args:
+            text: The text to chunk
+            
+        Yields:
+            Text chunks in order
+        """
+        for start, end in self.iter_spans(text):
+            yield text[start:end]
+    
+    def chunk_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find the chunks of a text without copying them out of it
+        
+        Args:
+            text: The text to chunk
+            
+        Returns:
+            List of (start, end) offsets such that text[start:end] is a chunk
+        """
+        return list(self.iter_spans(text))
+    
+    def iter_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Find the chunks of a text lazily
+        
+        Args:
+            text: The text to chunk
+            
+        Returns:
+            Iterator over the (start, end) offsets of the chunks
+        """
         if not text or not text.strip():
-            return []
+            return iter(())
         
-        if self.strategy == "sentence":
-            return self._chunk_by_sentence(text)
-        elif self.strategy == "fixed":
-            return self._chunk_fixed(text)
-        else:  # Default to hybrid approach
-            return self._chunk_hybrid(text)
+        # A text that fits in one chunk needs no breaks found (the sentence
+        # strategy still strips the whitespace around it)
+        if len(text) <= self.chunk_size:
+            if self.strategy == "sentence":
+                return iter([(len(text) - len(text.lstrip()), len(text.rstrip()))])
+            return iter([(0, len(text))])
+        
+        return self._chunk(text)
     
-    def _chunk_hybrid(self, text: str) -> List[str]:
+    def _chunk_hybrid(self, text: str) -> Iterator[Tuple[int, int]]:
         """
         Chunk by trying to find natural breaks like newlines or sentences
         
         Args:
             text: Text to chunk
             
-        Returns:
-            List of chunks
+        Yields:
+            (start, end) offsets of the chunks in order
         """
-        chunks = []
+        if NUMBA_AVAILABLE:
+            for start, end in hybrid_spans(text, self.chunk_size, self.chunk_overlap).tolist():
+                yield start, end
+            return
+        
+        # Locals rather than len() calls and attribute lookups in the loop
+        n = len(text)
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        half = chunk_size // 2
+        
         start = 0
+        breaks = _find_breaks(text)
+        # Number of positions of each separator before the previous window's end
+        counts = [0] * len(breaks)
         
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
+        while start < n:
+            end = min(start + chunk_size, n)
             
-            # Try to find a good breaking point
-            if end < len(text):
-                # Look for paragraph break first
-                para_break = text.rfind('\n\n', start, end)
-                if para_break > start + self.chunk_size // 2:
-                    end = para_break + 2
-                else:
-                    # Look for newline next
-                    newline_pos = text.rfind('\n', start, end)
-                    if newline_pos > start + self.chunk_size // 2:
-                        end = newline_pos + 1
-                    else:
-                        # Look for sentence end next
-                        for sep in ['. ', '! ', '? ', '.\n', '!\n', '?\n']:
-                            sent_end = text.rfind(sep, start, end)
-                            if sent_end > start + self.chunk_size // 2:
-                                end = sent_end + len(sep)
-                                break
-                        else:
-                            # Fall back to space
-                            space_pos = text.rfind(' ', start, end)
-                            if space_pos > start + self.chunk_size // 2:
-                                end = space_pos + 1
-            
-            # Add the chunk
-            chunks.append(text[start:end])
+            # Try to find a good breaking point: a paragraph break, then a
+            # newline, then a sentence end, then a space. The window only
+            # moves forward, so each search resumes where the last one ended
+            if end < n:
+                for i, (length, positions) in enumerate(breaks):
+                    counts[i] = _advance(positions, end - length, counts[i], chunk_size + 1)
+                    if counts[i] and positions[counts[i] - 1] > start + half:
+                        end = positions[counts[i] - 1] + length
+                        break
             
-            # Move start position for next chunk, considering overlap
-            start = end - self.chunk_overlap
+            yield start, end
+            
+            # Move start position for next chunk, considering overlap, but
+            # always forward so the loop ends
+            start = max(end - chunk_overlap, start + 1)
             
             # Avoid getting stuck in an infinite loop
-            if start >= end or end == len(text):
-                if end < len(text):
+            if start >= end or end == n:
+                if end < n:
                     start = end  # Skip ahead to avoid being stuck
                 else:
                     break
-        
-        return chunks
     
-    def _chunk_by_sentence(self, text: str) -> List[str]:
+    def _chunk_by_sentence(self, text: str) -> Iterator[Tuple[int, int]]:
         """
         Chunk by grouping sentences together
         
+        Chunks are slices of the text, so the whitespace between their
+        sentences is kept as it was.
+        
         Args:
             text: Text to chunk
             
-        Returns:
-            List of chunks
+        Yields:
+            (start, end) offsets of the chunks in order
         """
-        # Split text into sentences
-        sentence_endings = r'(?<=[.!?])\s+'
-        sentences = re.split(sentence_endings, text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        chunks = []
-        current_chunk = []
-        current_length = 0
+        # Start offsets of the sentences in the current chunk, which ends at chunk_end
+        sentence_starts = []
+        chunk_end = 0
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
         
-        for sentence in sentences:
-            sentence_len = len(sentence)
-            
+        for sent_start, sent_end in _sentence_spans(text):
             # Handle very long sentences
-            if sentence_len > self.chunk_size:
+            if sent_end - sent_start > chunk_size:
                 # If we have content in the current chunk, add it first
-                if current_chunk:
-                    chunks.append(' '.join(current_chunk))
-                    current_chunk = []
-                    current_length = 0
+                if sentence_starts:
+                    yield sentence_starts[0], chunk_end
+                    sentence_starts = []
                 
                 # Split the long sentence into fixed chunks
-                sent_chunks = self._chunk_fixed(sentence)
-                chunks.extend(sent_chunks)
+                yield from self._chunk_fixed(text, sent_start, sent_end)
                 continue
             
             # If adding this sentence would exceed the chunk size, start a new chunk
-            if current_length + sentence_len > self.chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
+            if sentence_starts and sent_end - sentence_starts[0] > chunk_size:
+                yield sentence_starts[0], chunk_end
                 
-                # Check if we need overlap
-                if self.chunk_overlap > 0:
-                    # Determine how many sentences to keep for overlap
-                    overlap_length = 0
-                    overlap_sentences = []
-                    
-                    for prev_sent in reversed(current_chunk):
-                        if overlap_length + len(prev_sent) <= self.chunk_overlap:
-                            overlap_sentences.insert(0, prev_sent)
-                            overlap_length += len(prev_sent) + 1  # +1 for the space
-                        else:
-                            break
-                    
-                    current_chunk = overlap_sentences
-                    current_length = overlap_length
-                else:
-                    current_chunk = []
-                    current_length = 0
+                # Keep the trailing sentences that fit in the overlap
+                del sentence_starts[:bisect_left(sentence_starts, chunk_end - chunk_overlap)]
             
             # Add the sentence to the current chunk
-            current_chunk.append(sentence)
-            current_length += sentence_len + 1  # +1 for space
+            sentence_starts.append(sent_start)
+            chunk_end = sent_end
         
         # Add the last chunk if it has content
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        return chunks
+        if sentence_starts:
+            yield sentence_starts[0], chunk_end
     
-    def _chunk_fixed(self, text: str) -> List[str]:
+    def _chunk_fixed(self, text: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, int]]:
         """
         Chunk by fixed size with overlap
         
         Args:
             text: Text to chunk
+            start: Offset of the part of the text to chunk
+            stop: End offset of the part of the text to chunk (None for the end)
             
-        Returns:
-            List of chunks
+        Yields:
+            (start, end) offsets of the chunks in order
         """
-        chunks = []
-        start = 0
+        if stop is None:
+            stop = len(text)
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
         
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
+        while start < stop:
+            end = min(start + chunk_size, stop)
             
-            # Add the chunk
-            chunks.append(text[start:end])
+            yield start, end
+            if end == stop:
+                break
             
             # Move start position for next chunk, considering overlap
-            start = end - self.chunk_overlap
+            start = max(end - chunk_overlap, start + 1)
             
             # Avoid getting stuck
             if start >= end:
                 start = end
-        
-        return chunks
@@ -0,0 +1,19 @@
+"""
+Deprecated alias of the documentor package under its historical misspelling.
+
+`import documetor` returns the documentor package itself. Only the top-level
+name is aliased; import submodules from documentor.
+"""
+
+import sys
+import warnings
+
+import documentor as _documentor
+
+warnings.warn(
+    "The documetor package is deprecated, import documentor instead",
+    DeprecationWarning,
+    stacklevel=2
+)
+
+sys.modules[__name__] = _documentor
@@ -1,15 +1,15 @@
 """
-Example of basic usage of the Documetor library.
+Example of basic usage of the Documentor library.
 """
 
 import os
 import sys
 from pprint import pprint
 
-# Add the parent directory to the path so we can import documetor
+# Add the parent directory to the path so we can import documentor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from documetor import DocumentEmbedder
+from documentor import DocumentEmbedder
 
 
 def main():
@@ -28,7 +28,8 @@ def main():
     embedder = DocumentEmbedder(
         project_id=project_id,
         store_type="local",  # Use local storage for simplicity
-        store_path="documents.pkl",  # Save embeddings to disk
+        store_path="documents",  # Save embeddings to disk (documents.npy and metadata files)
+        extraction_workers=os.cpu_count() or 1,  # Extract and chunk documents in parallel processes
         verbose=True  # Show detailed progress
     )
     
@@ -1,18 +1,30 @@
 """
-Example of extending Documetor with custom document processors.
+Example of extending Documentor with custom document processors.
 """
 
+import io
 import os
 import sys
 import csv
 import json
+import mmap
 from typing import Dict, List, Any
 
-# Add the parent directory to the path so we can import documetor
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add the parent directory to the path so we can import documentor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from documetor import DocumentEmbedder, DocumentProcessor
-from documetor.processors import register_processor
+from documentor import DocumentEmbedder, DocumentProcessor
+from documentor.processors import register_processor
 
 
 # Custom CSV Processor
@@ -29,31 +41,73 @@ class CSVProcessor(DocumentProcessor):
         Returns:
             Extracted text from the CSV
         """
+        if pd is not None:
+            try:
+                return self._extract_with_pandas(file_path)
+            except ValueError:
+                pass  # Leave empty and ragged files to the csv module
+        
         try:
-            lines = []
+            # Write straight into one buffer rather than building lists to join
+            buffer = io.StringIO()
+            write = buffer.write
             with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
                 reader = csv.reader(csvfile)
                 headers = next(reader)  # Get headers
                 
                 # Add headers as first line
-                lines.append(' | '.join(headers))
+                write(' | '.join(headers))
                 
                 # Process rows
                 for row in reader:
                     # Create a line with header:value pairs
-                    row_text = []
-                    for i, value in enumerate(row):
-                        if i < len(headers) and value:
-                            row_text.append(f"{headers[i]}: {value}")
-                    
-                    lines.append('. '.join(row_text))
+                    write('\n')
+                    separator = ''
+                    for header, value in zip(headers, row):
+                        if value:
+                            write(separator)
+                            write(header)
+                            write(': ')
+                            write(value)
+                            separator = '. '
             
-            return '\n'.join(lines)
+            return buffer.getvalue()
         except Exception as e:
             print(f"Error extracting text from CSV {file_path}: {str(e)}")
             return ""
 
 
+    def _extract_with_pandas(self, file_path: str) -> str:
+        """
+        Extract text from a CSV file, assembling the rows a column at a time
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            Extracted text from the CSV
+        """
+        # The header row is read as data so column names are kept as written.
+        # The file is memory-mapped so pandas parses the OS's pages of it
+        # directly instead of reading it through a buffer
+        table = pd.read_csv(
+            file_path, header=None, dtype=str, encoding='utf-8',
+            keep_default_na=False, skip_blank_lines=False, memory_map=True
+        ).fillna('')
+        headers = list(table.iloc[0])
+        rows = table.iloc[1:]
+        
+        # Append each column's header:value pairs to every row at once
+        text = pd.Series('', index=rows.index, dtype=object)
+        for column, header in zip(rows.columns, headers):
+            values = rows[column]
+            present = values != ''
+            separator = ((text != '') & present).map({True: '. ', False: ''})
+            text = text + separator + (header + ': ' + values).where(present, '')
+        
+        return '\n'.join([' | '.join(headers), *text])
+
+
 # Custom JSON Processor
 class JSONProcessor(DocumentProcessor):
     """Processor for JSON files"""
@@ -69,8 +123,7 @@ class JSONProcessor(DocumentProcessor):
             Extracted text from the JSON
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            data = self._load(file_path)
             
             # Convert JSON to text
             return self._json_to_text(data)
@@ -78,9 +131,33 @@ class JSONProcessor(DocumentProcessor):
             print(f"Error extracting text from JSON {file_path}: {str(e)}")
             return ""
     
+    def _load(self, file_path: str) -> Any:
+        """
+        Parse a JSON file, with orjson straight from a memory map when installed
+        
+        Args:
+            file_path: Path to the JSON file
+            
+        Returns:
+            Parsed JSON data
+        """
+        if orjson is not None:
+            with open(file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                try:
+                    return orjson.loads(memoryview(mapped))
+                except orjson.JSONDecodeError:
+                    pass  # e.g. NaN or integers beyond 64 bits, which json accepts
+        
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    
     def _json_to_text(self, data: Any, prefix: str = "") -> str:
         """
-        Recursively convert JSON to text
+        Convert JSON to text
+        
+        Walks the JSON with an explicit stack and writes into a single buffer,
+        so deep nesting neither recurses nor re-joins text at every level.
         
         Args:
             data: JSON data
@@ -89,27 +166,50 @@ class JSONProcessor(DocumentProcessor):
         Returns:
             Text representation of JSON
         """
-        if isinstance(data, dict):
-            lines = []
-            for key, value in data.items():
-                field_name = f"{prefix}{key}" if prefix else key
-                if isinstance(value, (dict, list)):
-                    lines.append(self._json_to_text(value, f"{field_name}."))
-                else:
-                    lines.append(f"{field_name}: {value}")
-            return "\n".join(lines)
-        elif isinstance(data, list):
-            if not data:
-                return ""
+        buffer = io.StringIO()
+        # Entries are (value, prefix) pairs still to convert, or text to write as is
+        stack = [(data, prefix)]
+        
+        while stack:
+            entry = stack.pop()
+            if isinstance(entry, str):
+                buffer.write(entry)
+                continue
+            
+            data, prefix = entry
+            if isinstance(data, dict):
+                parts = []
+                for key, value in data.items():
+                    field_name = f"{prefix}{key}" if prefix else key
+                    if isinstance(value, (dict, list)):
+                        parts.append((value, f"{field_name}."))
+                    else:
+                        parts.append(f"{field_name}: {value}")
+                separator = "\n"
+            elif isinstance(data, list):
+                if not data:
+                    continue
+                
+                # For simple lists, join items
+                if not all(isinstance(item, dict) for item in data):
+                    buffer.write(f"{prefix.rstrip('.')}: ")
+                    buffer.write(", ".join(str(item) for item in data))
+                    continue
                 
-            # If list contains dictionaries, process each item
-            if all(isinstance(item, dict) for item in data):
-                return "\n\n".join(self._json_to_text(item, prefix) for item in data)
+                # If list contains dictionaries, process each item
+                parts = [(item, prefix) for item in data]
+                separator = "\n\n"
+            else:
+                buffer.write(str(data))
+                continue
             
-            # For simple lists, join items
-            return f"{prefix.rstrip('.')}: " + ", ".join(str(item) for item in data)
-        else:
-            return str(data)
+            # Push the parts in reverse so they are written in order
+            for i in range(len(parts) - 1, -1, -1):
+                stack.append(parts[i])
+                if i:
+                    stack.append(separator)
+        
+        return buffer.getvalue()
 
 
 def main():
@@ -132,7 +232,8 @@ def main():
     embedder = DocumentEmbedder(
         project_id=project_id,
         store_type="local",
-        store_path="custom_processors.pkl",
+        store_path="custom_processors",
+        extraction_workers=os.cpu_count() or 1,
         verbose=True
     )
     
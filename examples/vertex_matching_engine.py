@@ -1,15 +1,15 @@
 """
-Example of using Documetor with Vertex AI Matching Engine for production-scale deployments.
+Example of using Documentor with Vertex AI Matching Engine for production-scale deployments.
 """
 
 import os
 import sys
 import time
 
-# Add the parent directory to the path so we can import documetor
+# Add the parent directory to the path so we can import documentor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from documetor import DocumentEmbedder, VertexMatchingEngineStore
+from documentor import DocumentEmbedder, VertexMatchingEngineStore
 
 
 def main():
@@ -30,7 +30,7 @@ def main():
         project_id=project_id,
         location="us-central1",  # Adjust to your preferred region
         store_type="vertex",
-        index_name="documetor-demo",  # Custom name for your index
+        index_name="documentor-demo",  # Custom name for your index
         embedding_model="textembedding-gecko@latest",
         verbose=True
     )
@@ -10,7 +10,7 @@ with open("README.md", "r", encoding="utf-8") as fh:
 setup(
     name="documentor",
     version="0.1.0",
-    author="Documetor Team",
+    author="Documentor Team",
     author_email="info@documentor.example.com",
     description="Document embeddings and semantic search with Google Vertex AI",
     long_description=long_description,
@@ -40,6 +40,8 @@ setup(
     ],
     extras_require={
         "ocr": ["pytesseract>=0.3.10", "pdf2image>=1.16.0"],
+        "fast": ["orjson>=3.9.0", "numba>=0.57.0", "pypdfium2>=4.0.0", "fastavro>=1.7.0", "msgpack>=1.0.0"],
+        "faiss": ["faiss-cpu>=1.7.4"],
         "dev": ["pytest>=7.0.0", "black>=22.3.0", "isort>=5.10.1", "mypy>=0.942"],
     },
     entry_points={
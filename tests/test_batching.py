@@ -0,0 +1,192 @@
+"""
+Tests for coalescing concurrent searches and embedding requests.
+"""
+
+import threading
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+from documentor.embedding.batching import BatchingEmbedder
+from documentor.storage.batching import BatchingSearcher
+from documentor.storage.local import LocalVectorStore
+
+
+class _RecordingStore(LocalVectorStore):
+    """Local store that records the shape of each search_batch call"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def search_batch(self, query_embeddings, top_k=5, filters=None):
+        self.release.wait()
+        self.calls.append((len(query_embeddings), top_k, filters))
+        return super().search_batch(query_embeddings, top_k=top_k, filters=filters)
+
+
+class _ShortStore:
+    """Store whose search_batch drops the last query's results"""
+
+    def search_batch(self, query_embeddings, top_k=5, filters=None):
+        return [[{"id": i}] for i in range(len(query_embeddings) - 1)]
+
+
+def _store():
+    store = _RecordingStore()
+    embeddings = np.eye(8, dtype=np.float32)
+    store.add_embeddings(embeddings, [{"id": i, "source": f"doc{i % 2}"} for i in range(8)])
+    return store
+
+
+def _search_concurrently(searcher, queries):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = [executor.submit(searcher.search, *query) for query in queries]
+        return [future.result(timeout=10) for future in futures]
+
+
+def test_searcher_coalesces_queries():
+    store = _store()
+    # Hold the first batch so the remaining queries queue up behind it
+    store.release.clear()
+    searcher = BatchingSearcher(store, max_batch=64, max_wait_ms=50)
+    queries = [(np.eye(8)[i], 1) for i in range(8)]
+    timer = threading.Timer(0.2, store.release.set)
+    timer.start()
+    try:
+        results = _search_concurrently(searcher, queries)
+    finally:
+        timer.cancel()
+        searcher.close()
+    
+    assert [result[0]["id"] for result in results] == list(range(8))
+    assert len(store.calls) < 8
+    assert sum(size for size, _, _ in store.calls) == 8
+
+
+def test_searcher_groups_by_parameters():
+    store = _store()
+    searcher = BatchingSearcher(store, max_batch=64, max_wait_ms=50)
+    queries = [(np.eye(8)[i], 1 + i % 2, {"source": f"doc{i % 2}"}) for i in range(8)]
+    try:
+        results = _search_concurrently(searcher, queries)
+    finally:
+        searcher.close()
+    
+    for i, result in enumerate(results):
+        assert len(result) == 1 + i % 2
+        assert result[0]["id"] == i
+        assert all(r["source"] == f"doc{i % 2}" for r in result)
+    for _, top_k, filters in store.calls:
+        assert filters == {"source": f"doc{top_k - 1}"}
+
+
+def test_searcher_fails_queries_without_results():
+    searcher = BatchingSearcher(_ShortStore(), max_batch=2, max_wait_ms=1000)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(searcher.search, np.ones(4), 1) for _ in range(2)]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result(timeout=10))
+            except RuntimeError:
+                outcomes.append(None)
+    searcher.close()
+    
+    # The batch held both queries: one got the only result, the other an error
+    assert sorted(outcome is None for outcome in outcomes) == [False, True]
+
+
+def test_searcher_propagates_store_errors():
+    class _FailingStore:
+        def search_batch(self, query_embeddings, top_k=5, filters=None):
+            raise ValueError("store unavailable")
+    
+    searcher = BatchingSearcher(_FailingStore(), max_wait_ms=1)
+    with pytest.raises(ValueError, match="store unavailable"):
+        searcher.search(np.ones(4))
+    searcher.close()
+
+
+class _FakeEmbedder:
+    """Embeds a text as [len(text), 1] and fails on any text containing bad"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_embeddings(self, texts, show_progress=False):
+        with self.lock:
+            self.calls.append(list(texts))
+        if any("bad" in text for text in texts):
+            raise ValueError("bad input")
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def _embed_concurrently(embedder, requests):
+    barrier = threading.Barrier(len(requests))
+    
+    def embed(texts):
+        barrier.wait()
+        return embedder.get_embeddings(texts)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        futures = [executor.submit(embed, texts) for texts in requests]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result(timeout=10))
+            except ValueError as e:
+                outcomes.append(e)
+        return outcomes
+
+
+def test_embedder_coalesces_requests():
+    fake = _FakeEmbedder()
+    embedder = BatchingEmbedder(fake, max_batch=1000, max_wait_ms=200)
+    requests = [["a" * (i + 1)] * (i + 1) for i in range(6)]
+    try:
+        outcomes = _embed_concurrently(embedder, requests)
+    finally:
+        embedder.close()
+    
+    # Each caller gets the rows for its own texts
+    for texts, embeddings in zip(requests, outcomes):
+        assert embeddings.shape == (len(texts), 2)
+        assert (embeddings[:, 0] == len(texts[0])).all()
+    assert len(fake.calls) < len(requests)
+    assert sum(len(call) for call in fake.calls) == sum(len(texts) for texts in requests)
+
+
+def test_embedder_sends_full_batches_immediately():
+    fake = _FakeEmbedder()
+    # A wait far longer than the test's timeout: only the size limit can send the batch
+    embedder = BatchingEmbedder(fake, max_batch=4, max_wait_ms=60000)
+    try:
+        outcomes = _embed_concurrently(embedder, [["x", "y"], ["z", "w"]])
+    finally:
+        embedder.close()
+    assert [embeddings.shape for embeddings in outcomes] == [(2, 2), (2, 2)]
+
+
+def test_embedder_isolates_failing_requests():
+    fake = _FakeEmbedder()
+    embedder = BatchingEmbedder(fake, max_batch=1000, max_wait_ms=200)
+    try:
+        outcomes = _embed_concurrently(embedder, [["good"], ["bad"], ["fine", "ok"]])
+    finally:
+        embedder.close()
+    
+    assert outcomes[0].tolist() == [[4.0, 1.0]]
+    assert isinstance(outcomes[1], ValueError)
+    assert outcomes[2].tolist() == [[4.0, 1.0], [2.0, 1.0]]
+
+
+def test_embedder_empty_request():
+    embedder = BatchingEmbedder(_FakeEmbedder())
+    assert embedder.get_embeddings([]).shape == (0, 0)
+    # Nothing was queued, so no background thread was started
+    assert embedder._thread is None
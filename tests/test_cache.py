@@ -0,0 +1,130 @@
+"""
+Tests for the semantic query cache and the chunk embedding cache.
+"""
+
+import numpy as np
+
+from documentor.core.cache import SemanticCache
+from documentor.embedding.cache import ChunkEmbeddingCache
+
+
+def test_semantic_cache_hit_and_miss():
+    cache = SemanticCache(threshold=0.9, max_size=10)
+    cache.put([1.0, 0.0, 0.0], [{"id": 1}], key=5)
+    
+    # A nearby query with the same search parameters is a hit
+    assert cache.get([1.0, 0.1, 0.0], key=5) == [{"id": 1}]
+    # A dissimilar query or other search parameters are misses
+    assert cache.get([0.0, 1.0, 0.0], key=5) is None
+    assert cache.get([1.0, 0.0, 0.0], key=10) is None
+
+
+def test_semantic_cache_returns_copies():
+    cache = SemanticCache(threshold=0.9, max_size=10)
+    results = [{"id": 1}]
+    cache.put([1.0, 0.0], results)
+    results[0]["id"] = 2
+    
+    hit = cache.get([1.0, 0.0])
+    hit[0]["id"] = 3
+    assert cache.get([1.0, 0.0]) == [{"id": 1}]
+
+
+def test_semantic_cache_hits_do_not_move_entries():
+    cache = SemanticCache(threshold=0.95, max_size=10)
+    cache.put([1.0, 0.0], [{"id": 1}])
+    
+    # Hits at the edge of the threshold must not drag the entry towards them
+    angle = np.arccos(0.96)
+    for _ in range(20):
+        assert cache.get([np.cos(angle), np.sin(angle)]) == [{"id": 1}]
+    assert cache.get([np.cos(angle), -np.sin(angle)]) == [{"id": 1}]
+
+
+def test_semantic_cache_merges_paraphrases():
+    cache = SemanticCache(threshold=0.95, max_size=10, merge_threshold=0.8)
+    first = [1.0, 0.0]
+    angle = np.arccos(0.9)
+    second = [np.cos(angle), np.sin(angle)]
+    
+    cache.put(first, [{"id": 1}])
+    # Too far for a hit, close enough to be folded into the same entry
+    assert cache.get(second) is None
+    cache.put(second, [{"id": 2}])
+    
+    assert len(cache) == 1
+    assert cache._counts.tolist() == [2]
+    # The entry's centroid lies between the two queries, so both now hit it
+    assert cache.get(first) == [{"id": 2}]
+    assert cache.get(second) == [{"id": 2}]
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    cache = SemanticCache(threshold=0.9, max_size=2)
+    cache.put([1.0, 0.0, 0.0], [{"id": 1}], key="a")
+    cache.put([0.0, 1.0, 0.0], [{"id": 2}], key="b")
+    assert cache.get([1.0, 0.0, 0.0], key="a") is not None
+    
+    cache.put([0.0, 0.0, 1.0], [{"id": 3}], key="c")
+    assert len(cache) == 2
+    assert cache.get([0.0, 1.0, 0.0], key="b") is None
+    assert cache.get([1.0, 0.0, 0.0], key="a") == [{"id": 1}]
+    assert cache.get([0.0, 0.0, 1.0], key="c") == [{"id": 3}]
+    # Search parameters with no entries left are forgotten
+    assert "b" not in cache._key_map
+
+
+def test_semantic_cache_disabled():
+    cache = SemanticCache(max_size=0)
+    cache.put([1.0, 0.0], [{"id": 1}])
+    assert len(cache) == 0
+    assert cache.get([1.0, 0.0]) is None
+
+
+def test_chunk_cache_hit_and_miss():
+    cache = ChunkEmbeddingCache("model")
+    keys = [cache.key("first"), cache.key("second")]
+    assert cache.get_many(keys) == {}
+    
+    cache.put_many(keys[:1], np.array([[1.0, 2.0]], dtype=np.float32))
+    found = cache.get_many(keys)
+    assert list(found) == keys[:1]
+    np.testing.assert_array_equal(found[keys[0]], [1.0, 2.0])
+
+
+def test_chunk_cache_keys_depend_on_model():
+    assert ChunkEmbeddingCache("model@1").key("text") != ChunkEmbeddingCache("model@2").key("text")
+    assert ChunkEmbeddingCache("model").key("text") == ChunkEmbeddingCache("model").key("text")
+
+
+def test_chunk_cache_persists(tmp_path):
+    path = str(tmp_path / "cache" / "chunks.sqlite")
+    cache = ChunkEmbeddingCache("model", path=path)
+    key = cache.key("text")
+    cache.put_many([key], np.array([[0.5, 0.25]], dtype=np.float32))
+    cache.close()
+    
+    reopened = ChunkEmbeddingCache("model", path=path)
+    np.testing.assert_array_equal(reopened.get_many([key])[key], [0.5, 0.25])
+    # Embeddings of another model are not reused
+    other = ChunkEmbeddingCache("other-model", path=path)
+    assert other.get_many([other.key("text")]) == {}
+    reopened.close()
+    other.close()
+
+
+def test_chunk_cache_memory_is_bounded(tmp_path):
+    cache = ChunkEmbeddingCache("model", path=str(tmp_path / "chunks.sqlite"), memory_size=2)
+    keys = [cache.key(f"chunk {i}") for i in range(3)]
+    cache.put_many(keys[:2], np.array([[0.0], [1.0]], dtype=np.float32))
+    # Using the first entry makes the second the least recently used
+    cache.get_many(keys[:1])
+    cache.put_many(keys[2:], np.array([[2.0]], dtype=np.float32))
+    
+    assert len(cache._memory) == 2
+    assert keys[1] not in cache._memory
+    # Entries dropped from memory are still read back from SQLite
+    found = cache.get_many(keys)
+    assert [float(found[k][0]) for k in keys] == [0.0, 1.0, 2.0]
+    assert len(cache._memory) == 2
+    cache.close()
@@ -0,0 +1,82 @@
+"""
+Tests for the text chunker.
+"""
+
+import random
+
+import pytest
+
+from documentor.text import chunker as chunker_module
+from documentor.text.chunker import TextChunker
+
+# Words and separators the random texts are built from, so every kind of
+# break the hybrid strategy looks for occurs
+_PIECES = ["lorem", "ipsum", "dolor", "sit", "amet", "été", "中文",
+           " ", " ", " ", ". ", "! ", "? ", ".\n", "\n", "\n\n"]
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    parts = []
+    size = 0
+    while size < length:
+        piece = rng.choice(_PIECES)
+        parts.append(piece)
+        size += len(piece)
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("strategy", ["hybrid", "sentence", "fixed"])
+@pytest.mark.parametrize("chunk_overlap", [100, 150])
+def test_overlap_not_below_chunk_size_is_rejected(strategy, chunk_overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=100, chunk_overlap=chunk_overlap, strategy=strategy)
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(0, 0), (-1, 0), (100, -1)])
+def test_invalid_sizes_are_rejected(chunk_size, chunk_overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+@pytest.mark.parametrize("strategy", ["hybrid", "sentence", "fixed"])
+def test_short_text_is_one_chunk(strategy):
+    text = "A short text. It fits in one chunk."
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10, strategy=strategy)
+    assert chunker.chunk_text(text) == [text]
+    assert chunker.chunk_text("") == []
+
+
+@pytest.mark.parametrize("strategy", ["hybrid", "fixed"])
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(50, 0), (50, 10), (64, 40), (100, 99)])
+def test_spans_cover_text_and_move_forward(strategy, chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size * 1000 + chunk_overlap)
+    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, strategy=strategy)
+    for _ in range(20):
+        text = _random_text(rng, rng.randrange(1, 2000))
+        spans = chunker.chunk_spans(text)
+        
+        assert spans[0][0] == 0
+        assert spans[-1][1] == len(text)
+        for (start, end), (next_start, next_end) in zip(spans, spans[1:]):
+            assert next_start > start
+            assert next_end >= end
+            assert next_start <= end
+        for start, end in spans:
+            assert 0 < end - start <= chunk_size
+        assert chunker.chunk_text(text) == [text[start:end] for start, end in spans]
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(50, 0), (50, 10), (64, 40), (100, 99), (300, 200)])
+def test_numba_and_python_hybrid_spans_match(monkeypatch, chunk_size, chunk_overlap):
+    pytest.importorskip("numba")
+    rng = random.Random(chunk_size * 1000 + chunk_overlap)
+    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, strategy="hybrid")
+    texts = [_random_text(rng, rng.randrange(1, 3000)) for _ in range(30)]
+    # ASCII-only texts go through the kernel's uint8 variant
+    texts += [text.encode("ascii", "ignore").decode() for text in texts]
+    
+    numba_spans = [chunker.chunk_spans(text) for text in texts]
+    monkeypatch.setattr(chunker_module, "NUMBA_AVAILABLE", False)
+    python_spans = [chunker.chunk_spans(text) for text in texts]
+    
+    assert numba_spans == python_spans
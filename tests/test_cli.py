@@ -0,0 +1,32 @@
+"""
+Tests for the command-line interface.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("google.cloud.aiplatform")
+
+from typer.testing import CliRunner
+
+from documentor.cli import app
+
+
+def test_info_does_not_modify_legacy_store(tmp_path):
+    store_path = tmp_path / "documents.pkl"
+    embeddings = np.eye(3, 4, dtype=np.float32).tolist()
+    metadata = [{"source": "a.pdf"}, {"source": "a.pdf"}, {"source": "b.pdf"}]
+    with open(store_path, "wb") as f:
+        pickle.dump((embeddings, metadata), f)
+    before = sorted(path.name for path in tmp_path.iterdir())
+    contents = store_path.read_bytes()
+    
+    result = CliRunner().invoke(app, ["info", "--store-path", str(store_path)])
+    
+    assert result.exit_code == 0, result.output
+    assert "Total vectors: 3" in result.output
+    assert "Total documents: 2" in result.output
+    assert sorted(path.name for path in tmp_path.iterdir()) == before
+    assert store_path.read_bytes() == contents
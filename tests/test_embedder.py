@@ -0,0 +1,118 @@
+"""
+Tests for the document embedder's directory processing.
+"""
+
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("google.cloud.aiplatform")
+
+from documentor.core import embedder as embedder_module
+from documentor.core.embedder import DocumentEmbedder
+
+
+def _make_tree(root, num_files):
+    for i in range(num_files):
+        directory = root / f"dir{i % 3}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"file{i}.pdf").write_bytes(b"")
+
+
+def _bare_embedder(max_workers=1):
+    # Directory processing only needs these attributes, not the API clients
+    embedder = DocumentEmbedder.__new__(DocumentEmbedder)
+    embedder.max_workers = max_workers
+    return embedder
+
+
+def _walker_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "directory-walker"]
+
+
+def test_directory_is_streamed_to_processing(tmp_path, monkeypatch):
+    _make_tree(tmp_path, 20)
+    monkeypatch.setattr(embedder_module, "DEFAULT_FILE_QUEUE_SIZE", 2)
+    seen = []
+    
+    def record(files):
+        seen.extend(files)
+        return len(seen)
+    
+    embedder = _bare_embedder()
+    embedder._process_files_sequential = record
+    
+    embedder.process_directory(str(tmp_path))
+    
+    assert sorted(seen) == sorted(str(path) for path in tmp_path.rglob("*.pdf"))
+    assert not _walker_threads()
+
+
+def test_walker_stops_when_processing_fails(tmp_path, monkeypatch):
+    _make_tree(tmp_path, 50)
+    # A queue much smaller than the tree, so the walker blocks on it
+    monkeypatch.setattr(embedder_module, "DEFAULT_FILE_QUEUE_SIZE", 2)
+    
+    def fail_after_first(files):
+        next(iter(files))
+        raise RuntimeError("processing failed")
+    
+    embedder = _bare_embedder()
+    embedder._process_files_sequential = fail_after_first
+    
+    with pytest.raises(RuntimeError, match="processing failed"):
+        embedder.process_directory(str(tmp_path))
+    assert not _walker_threads()
+
+
+_EXTENSIONS = frozenset({".pdf", ".docx"})
+
+
+def _relative(root, paths):
+    return sorted(os.path.relpath(path, root) for path in paths)
+
+
+def test_iter_files_filters_by_extension(tmp_path):
+    for name in ("a.pdf", "b.DOCX", "c.txt", "d.pdf.bak", "pdf"):
+        (tmp_path / name).write_bytes(b"")
+    # A directory named like a document is not yielded
+    (tmp_path / "e.pdf").mkdir()
+    
+    found = embedder_module._iter_files(str(tmp_path), False, _EXTENSIONS)
+    assert _relative(tmp_path, found) == ["a.pdf", "b.DOCX"]
+
+
+def test_iter_files_recursion(tmp_path):
+    (tmp_path / "a.pdf").write_bytes(b"")
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    (tmp_path / "sub" / "b.pdf").write_bytes(b"")
+    (tmp_path / "sub" / "deeper" / "c.docx").write_bytes(b"")
+    
+    assert _relative(tmp_path, embedder_module._iter_files(str(tmp_path), False, _EXTENSIONS)) == ["a.pdf"]
+    assert _relative(tmp_path, embedder_module._iter_files(str(tmp_path), True, _EXTENSIONS)) == [
+        "a.pdf", os.path.join("sub", "b.pdf"), os.path.join("sub", "deeper", "c.docx")
+    ]
+
+
+def test_iter_files_does_not_follow_directory_symlinks(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.pdf").write_bytes(b"")
+    # Following this link would recurse forever
+    os.symlink(tmp_path, tmp_path / "sub" / "loop")
+    
+    found = embedder_module._iter_files(str(tmp_path), True, _EXTENSIONS)
+    assert _relative(tmp_path, found) == [os.path.join("sub", "a.pdf")]
+
+
+def test_iter_files_skips_missing_directories(tmp_path):
+    assert list(embedder_module._iter_files(str(tmp_path / "missing"), True, _EXTENSIONS)) == []
+
+
+def test_iter_files_is_lazy(tmp_path):
+    _make_tree(tmp_path, 6)
+    files = embedder_module._iter_files(str(tmp_path), True, _EXTENSIONS)
+    first = next(files)
+    
+    assert first.endswith(".pdf")
+    assert len([first, *files]) == 6
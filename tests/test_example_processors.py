@@ -0,0 +1,166 @@
+"""
+Tests for the CSV and JSON processors of the custom processors example.
+"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+pytest.importorskip("google.cloud.aiplatform")
+
+_EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "examples", "custom_processors.py")
+_spec = importlib.util.spec_from_file_location("custom_processors", _EXAMPLE)
+custom_processors = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(custom_processors)
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+_CSV = "name,city,age\nAda,London,36\nAlan,,41\n,,\nGrace,Arlington,\n"
+_CSV_TEXT = "name | city | age\nname: Ada. city: London. age: 36\nname: Alan. age: 41\n\nname: Grace. city: Arlington"
+
+
+@pytest.fixture
+def without_pandas(monkeypatch):
+    monkeypatch.setattr(custom_processors, "pd", None)
+
+
+def test_csv_rows_as_header_value_pairs(tmp_path, without_pandas):
+    path = _write(tmp_path / "people.csv", _CSV)
+    assert custom_processors.CSVProcessor().extract_text(path) == _CSV_TEXT
+
+
+def test_csv_quoting_and_short_rows(tmp_path, without_pandas):
+    path = _write(tmp_path / "quoted.csv", 'a,b,c\n"x, y","line\nbreak"\n')
+    assert custom_processors.CSVProcessor().extract_text(path) == "a | b | c\na: x, y. b: line\nbreak"
+
+
+def test_csv_with_only_headers_or_nothing(tmp_path, without_pandas):
+    processor = custom_processors.CSVProcessor()
+    assert processor.extract_text(_write(tmp_path / "headers.csv", "a,b\n")) == "a | b"
+    # No header row to read
+    assert processor.extract_text(_write(tmp_path / "empty.csv", "")) == ""
+
+
+needs_pandas = pytest.mark.skipif(custom_processors.pd is None, reason="pandas not installed")
+
+
+@needs_pandas
+@pytest.mark.parametrize("text", [
+    _CSV,
+    'a,b,c\n"x, y","line\nbreak",\n',
+    "NA,null,1\nNaN,,007\n",
+    "a,b\n\nx,y\n",
+    "a,b\n",
+])
+def test_pandas_matches_the_csv_module(tmp_path, monkeypatch, text):
+    path = _write(tmp_path / "table.csv", text)
+    processor = custom_processors.CSVProcessor()
+    
+    result = processor._extract_with_pandas(path)
+    monkeypatch.setattr(custom_processors, "pd", None)
+    assert result == processor.extract_text(path)
+
+
+@needs_pandas
+def test_pandas_falls_back_on_ragged_and_empty_files(tmp_path, monkeypatch):
+    processor = custom_processors.CSVProcessor()
+    ragged = _write(tmp_path / "ragged.csv", "a,b\n1,2,3\n")
+    empty = _write(tmp_path / "empty.csv", "")
+    
+    with pytest.raises(ValueError):
+        processor._extract_with_pandas(ragged)
+    assert processor.extract_text(ragged) == "a | b\na: 1. b: 2"
+    assert processor.extract_text(empty) == ""
+
+
+_JSON_DATA = {
+    "title": "Doc",
+    "meta": {"author": "A", "tags": ["x", 2, None], "nested": {"deep": True}},
+    "items": [{"n": 1, "sub": {"m": "a"}}, {"n": 2}],
+    "empty": [],
+    "mixed": [{"a": 1}, 3],
+    "count": 1.5,
+}
+# Output of the original recursive implementation
+_JSON_TEXT = (
+    "title: Doc\n"
+    "meta.author: A\nmeta.tags: x, 2, None\nmeta.nested.deep: True\n"
+    "items.n: 1\nitems.sub.m: a\n\nitems.n: 2\n"
+    "\n"
+    "mixed: {'a': 1}, 3\n"
+    "count: 1.5"
+)
+
+
+def test_json_to_text_matches_recursive_output():
+    processor = custom_processors.JSONProcessor()
+    assert processor._json_to_text(_JSON_DATA) == _JSON_TEXT
+    assert processor._json_to_text([1, 2], "values.") == "values: 1, 2"
+    assert processor._json_to_text("plain") == "plain"
+    assert processor._json_to_text({}) == ""
+
+
+def test_json_to_text_handles_deep_nesting():
+    data = {"leaf": "end"}
+    for _ in range(5000):
+        data = {"k": data}
+    
+    text = custom_processors.JSONProcessor()._json_to_text(data)
+    assert text == "k." * 5000 + "leaf: end"
+
+
+needs_orjson = pytest.mark.skipif(custom_processors.orjson is None, reason="orjson not installed")
+
+
+def _open_files():
+    return len(os.listdir("/proc/self/fd"))
+
+
+@needs_orjson
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_json_is_read_from_a_released_memory_map(tmp_path):
+    path = _write(tmp_path / "data.json", '{"name": "Zoë", "tags": ["ä", "ß"]}')
+    processor = custom_processors.JSONProcessor()
+    processor.extract_text(path)
+    
+    before = _open_files()
+    assert processor.extract_text(path) == "name: Zoë\ntags: ä, ß"
+    assert _open_files() == before
+
+
+def test_empty_json_file(tmp_path):
+    # Nothing to map or parse
+    assert custom_processors.JSONProcessor().extract_text(_write(tmp_path / "empty.json", "")) == ""
+
+
+@needs_pandas
+def test_memory_mapped_csv_keeps_utf8(tmp_path):
+    path = _write(tmp_path / "names.csv", "naïve,名前\ncafé,東京\n")
+    assert custom_processors.CSVProcessor().extract_text(path) == "naïve | 名前\nnaïve: café. 名前: 東京"
+
+
+@needs_orjson
+def test_orjson_and_json_give_the_same_text(tmp_path, monkeypatch):
+    path = _write(tmp_path / "data.json", json.dumps(_JSON_DATA))
+    processor = custom_processors.JSONProcessor()
+    
+    assert processor.extract_text(path) == _JSON_TEXT
+    monkeypatch.setattr(custom_processors, "orjson", None)
+    assert processor.extract_text(path) == _JSON_TEXT
+
+
+@needs_orjson
+def test_json_that_orjson_rejects_is_parsed_with_json(tmp_path):
+    # NaN and integers beyond 64 bits are accepted by the json module only
+    path = _write(tmp_path / "data.json", '{"ratio": NaN, "big": 123456789012345678901234567890}')
+    assert custom_processors.JSONProcessor().extract_text(path) == "ratio: nan\nbig: 123456789012345678901234567890"
+
+
+def test_invalid_json_gives_no_text(tmp_path):
+    assert custom_processors.JSONProcessor().extract_text(_write(tmp_path / "bad.json", "{oops")) == ""
@@ -0,0 +1,51 @@
+"""
+Tests for the local store's search kernels.
+"""
+
+import numpy as np
+import pytest
+
+from documentor.storage import _kernels
+from documentor.storage._kernels import encode_query, normalize, prepare_query
+
+
+def test_prepared_queries_are_read_only():
+    query = np.array([3.0, 4.0], dtype=np.float32)
+    unit = prepare_query(query)
+    np.testing.assert_allclose(unit, [0.6, 0.8])
+    with pytest.raises(ValueError):
+        unit[0] = 1.0
+    
+    codes, _ = encode_query(query)
+    with pytest.raises(ValueError):
+        codes[0] = 1
+
+
+def test_prepared_queries_follow_the_input():
+    query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    first = prepare_query(query)
+    # Changing the caller's array must not return the stale cached vector
+    query[:] = [0.0, 2.0, 0.0]
+    np.testing.assert_allclose(prepare_query(query), [0.0, 1.0, 0.0])
+    np.testing.assert_allclose(first, [1.0, 0.0, 0.0])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_prepared_query_matches_normalize(dtype):
+    rng = np.random.default_rng(1)
+    query = rng.normal(size=64).astype(dtype)
+    np.testing.assert_allclose(prepare_query(query), normalize(query)[0], rtol=1e-6)
+    assert prepare_query(query) is prepare_query(query.copy())
+
+
+def test_kernels_accept_cached_queries():
+    rng = np.random.default_rng(2)
+    embeddings, _ = normalize(rng.normal(size=(500, 32)))
+    query = rng.normal(size=32).astype(np.float32)
+    # Searching twice goes through the cache the second time
+    first = _kernels.topk_cosine(embeddings, query, None, 5)
+    second = _kernels.topk_cosine(embeddings, query, None, 5)
+    expected = _kernels.topk_cosine_numpy(embeddings, query, None, 5)
+    for result in (first, second):
+        np.testing.assert_array_equal(result[0], expected[0])
+        np.testing.assert_allclose(result[1], expected[1], rtol=1e-5)
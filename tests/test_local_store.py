@@ -0,0 +1,174 @@
+"""
+Tests for saving, loading and migrating the local vector store.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from documentor.storage import local
+from documentor.storage.local import LocalVectorStore
+
+
+def _data(n: int = 20, dim: int = 8):
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(n, dim)).astype(np.float32)
+    metadata = [{"id": i, "source": f"doc{i % 3}.txt", "text": f"chunk {i}"} for i in range(n)]
+    return embeddings, metadata
+
+
+def _assert_same_store(store: LocalVectorStore, embeddings: np.ndarray, metadata):
+    assert store.metadata == metadata
+    expected = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.testing.assert_allclose(store.embeddings, expected, rtol=1e-5, atol=1e-6)
+    
+    results = store.search(embeddings[3], top_k=1)
+    assert results[0]["id"] == 3
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_save_and_load(tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    
+    store = LocalVectorStore(store_path=store_path)
+    store.add_embeddings(embeddings[:10], metadata[:10])
+    store.add_embeddings(embeddings[10:], metadata[10:])
+    assert LocalVectorStore.exists(store_path)
+    
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_loaded_store_can_grow(tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[:10], metadata[:10])
+    
+    # The loaded matrix is memory-mapped and read-only until the first add
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[10:], metadata[10:])
+    
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_filtered_search_after_load(tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings, metadata)
+    
+    store = LocalVectorStore(store_path=store_path)
+    results = store.search(embeddings[4], top_k=20, filters={"source": "doc1.txt"})
+    assert {result["id"] for result in results} == {i for i in range(20) if i % 3 == 1}
+    assert results[0]["id"] == 4
+
+
+def test_jsonl_store_keeps_its_format(tmp_path, monkeypatch):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    
+    monkeypatch.setattr(local, "msgpack", None)
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[:10], metadata[:10])
+    assert os.path.exists(store_path + ".meta.jsonl")
+    monkeypatch.undo()
+    
+    # Adding with msgpack installed doesn't switch the store's format
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[10:], metadata[10:])
+    assert os.path.exists(store_path + ".meta.jsonl")
+    assert not os.path.exists(store_path + ".meta.msgpack")
+    
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_msgpack_round_trip(tmp_path):
+    pytest.importorskip("msgpack")
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    metadata[0]["tags"] = ["a", "b"]
+    metadata[1]["page"] = np.int64(3)
+    
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings, metadata)
+    assert os.path.exists(store_path + ".meta.msgpack")
+    assert not os.path.exists(store_path + ".meta.jsonl")
+    
+    store = LocalVectorStore(store_path=store_path)
+    assert store.metadata[0]["tags"] == ["a", "b"]
+    assert store.metadata[1]["page"] == 3
+    _assert_same_store(store, embeddings, metadata)
+
+
+def test_msgpack_store_without_msgpack_is_not_overwritten(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings, metadata)
+    
+    # Opening must fail rather than start an empty store that is saved over this one
+    monkeypatch.setattr(local, "msgpack", None)
+    with pytest.raises(ImportError):
+        LocalVectorStore(store_path=store_path)
+    monkeypatch.undo()
+    
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_unreadable_store_raises(tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings, metadata)
+    with open(store_path + ".npy", "wb") as f:
+        f.write(b"not a numpy file")
+    
+    with pytest.raises(Exception):
+        LocalVectorStore(store_path=store_path)
+
+
+def _snapshot(directory):
+    return {path.name: (path.stat().st_mtime_ns, path.read_bytes()) for path in directory.iterdir()}
+
+
+def test_legacy_pickle_store_is_migrated_on_write(tmp_path):
+    store_path = str(tmp_path / "store.pkl")
+    embeddings, metadata = _data()
+    with open(store_path, "wb") as f:
+        pickle.dump((embeddings[:10].tolist(), metadata[:10]), f)
+    assert LocalVectorStore.exists(store_path)
+    
+    # Opening the store to read it leaves the files alone
+    before = _snapshot(tmp_path)
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings[:10], metadata[:10])
+    assert _snapshot(tmp_path) == before
+    
+    # The first add saves the store in the current format
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[10:], metadata[10:])
+    assert os.path.exists(store_path + ".npy")
+    assert os.path.exists(store_path + ".norms.npy")
+    os.remove(store_path)
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_unnormalized_store_is_migrated_on_write(tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    
+    # Stores saved before embeddings were normalized on insert have no norms file
+    np.save(store_path + ".npy", embeddings[:10].astype(np.float64))
+    with open(store_path + ".meta.jsonl", "wb") as f:
+        for meta in metadata[:10]:
+            f.write(local.dump_json(meta) + b"\n")
+    
+    before = _snapshot(tmp_path)
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings[:10], metadata[:10])
+    assert _snapshot(tmp_path) == before
+    
+    LocalVectorStore(store_path=store_path).add_embeddings(embeddings[10:], metadata[10:])
+    assert os.path.exists(store_path + ".norms.npy")
+    assert np.load(store_path + ".npy").dtype == np.float32
+    _assert_same_store(LocalVectorStore(store_path=store_path), embeddings, metadata)
+
+
+def test_other_files_are_not_legacy_stores(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not a vector store")
+    assert not LocalVectorStore.exists(str(path))
+    assert not LocalVectorStore.exists(str(tmp_path / "missing"))
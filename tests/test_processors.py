@@ -0,0 +1,138 @@
+"""
+Tests for extracting text from PDF and Word documents.
+"""
+
+import threading
+
+import pytest
+from docx import Document
+
+from documentor.processors import pdf
+from documentor.processors.docx import DocxProcessor
+from documentor.processors.pdf import PDFProcessor
+
+
+def _write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per page"""
+    num_pages = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(num_pages)), num_pages
+        ),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+    return str(path)
+
+
+def test_pypdf2_extraction_joins_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "pdfium", None)
+    path = _write_pdf(tmp_path / "doc.pdf", ["First page", "Second page", "Third page"])
+    
+    text = PDFProcessor().extract_text(path)
+    assert text.split("\n") == ["First page", "Second page", "Third page"]
+
+
+def test_unreadable_pdf_gives_no_text(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+    assert PDFProcessor().extract_text(str(path)) == ""
+
+
+class _FakeTesseract:
+    """Recognizes a page 'image' (its number) after waiting for other pages to start"""
+    
+    def __init__(self, num_threads):
+        self.barrier = threading.Barrier(num_threads, timeout=5)
+    
+    def image_to_string(self, image):
+        self.barrier.wait()
+        return f"page {image}"
+
+
+def test_ocr_pages_are_recognized_concurrently_in_order(tmp_path, monkeypatch):
+    tesseract = _FakeTesseract(num_threads=3)
+    rendered = {}
+    
+    def convert_from_path(file_path, thread_count):
+        rendered["thread_count"] = thread_count
+        return [1, 2, 3, 4, 5, 6]
+    
+    monkeypatch.setattr(pdf, "OCR_AVAILABLE", True)
+    monkeypatch.setattr(pdf, "_tesseract_available", lambda: True)
+    monkeypatch.setattr(pdf, "convert_from_path", convert_from_path, raising=False)
+    monkeypatch.setattr(pdf, "pytesseract", tesseract, raising=False)
+    
+    path = str(tmp_path / "scan.pdf")
+    processor = PDFProcessor(use_ocr=True, ocr_threads=3)
+    assert processor._extract_with_ocr(path) == "\n".join(f"page {i}" for i in range(1, 7))
+    assert rendered["thread_count"] == 3
+
+
+def test_ocr_without_dependencies(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "OCR_AVAILABLE", False)
+    assert PDFProcessor(use_ocr=True)._extract_with_ocr(str(tmp_path / "scan.pdf")) == ""
+
+
+@pytest.mark.skipif(pdf.pdfium is None, reason="pypdfium2 not installed")
+def test_pdfium_extraction_matches_pypdf2(tmp_path, monkeypatch):
+    path = _write_pdf(tmp_path / "doc.pdf", ["First page", "Second page"])
+    
+    text = PDFProcessor().extract_text(path)
+    assert [line.strip() for line in text.split("\n")] == ["First page", "Second page"]
+    assert "\r" not in text
+    
+    monkeypatch.setattr(pdf, "pdfium", None)
+    assert [line.strip() for line in PDFProcessor().extract_text(path).split("\n")] == ["First page", "Second page"]
+
+
+@pytest.mark.skipif(pdf.pdfium is None, reason="pypdfium2 not installed")
+def test_pdfium_used_when_installed(tmp_path, monkeypatch):
+    path = _write_pdf(tmp_path / "doc.pdf", ["Only page"])
+    
+    def fail(file_path):
+        raise AssertionError("PyPDF2 used although pypdfium2 is installed")
+    
+    monkeypatch.setattr(PDFProcessor, "_extract_with_pypdf2", staticmethod(fail))
+    assert PDFProcessor().extract_text(path).strip() == "Only page"
+
+
+def test_docx_paragraphs_then_table_cells(tmp_path):
+    document = Document()
+    document.add_paragraph("Introduction")
+    document.add_paragraph("")
+    document.add_paragraph("Body text")
+    table = document.add_table(rows=2, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"cell {r}{c}"
+    path = str(tmp_path / "doc.docx")
+    document.save(path)
+    
+    text = DocxProcessor().extract_text(path)
+    # Empty paragraphs are skipped; cells follow the paragraphs row by row
+    assert text.split("\n") == ["Introduction", "Body text", "cell 00", "cell 01", "cell 10", "cell 11"]
+
+
+def test_unreadable_docx_gives_no_text(tmp_path):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"not a docx")
+    assert DocxProcessor().extract_text(str(path)) == ""
@@ -0,0 +1,341 @@
+"""
+Tests for searching the local vector store with each quantization and backend.
+"""
+
+import numpy as np
+import pytest
+
+from documentor.storage import _kernels, local
+from documentor.storage.local import LocalVectorStore
+
+
+def _data(n: int = 200, dim: int = 16):
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(n, dim)).astype(np.float32)
+    metadata = [{"id": i, "source": f"doc{i % 4}.txt"} for i in range(n)]
+    return embeddings, metadata
+
+
+def _store(n: int = 200, dim: int = 16, **kwargs) -> LocalVectorStore:
+    store = LocalVectorStore(**kwargs)
+    store.add_embeddings(*_data(n, dim))
+    return store
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+def test_int8_search_matches_float_search():
+    exact = _store()
+    quantized = _store(quantize="int8")
+    queries = np.random.default_rng(1).normal(size=(10, 16)).astype(np.float32)
+    
+    for query in queries:
+        expected = exact.search(query, top_k=5)
+        results = quantized.search(query, top_k=5)
+        # Quantization may swap near-ties, but the best match and scores stay put
+        assert results[0]["id"] == expected[0]["id"]
+        assert len(set(_ids(results)) & set(_ids(expected))) >= 4
+        np.testing.assert_allclose(
+            [r["similarity"] for r in results], [r["similarity"] for r in expected], atol=0.02
+        )
+
+
+def test_int8_search_with_filters():
+    store = _store(quantize="int8")
+    embeddings, _ = _data()
+    
+    results = store.search(embeddings[5], top_k=10, filters={"source": "doc1.txt"})
+    assert results[0]["id"] == 5
+    assert len(results) == 10
+    assert all(result["source"] == "doc1.txt" for result in results)
+
+
+def test_int8_codes_cover_added_rows():
+    store = _store(quantize="int8")
+    embeddings, metadata = _data(10)
+    store.add_embeddings(embeddings * 3, metadata)
+    
+    results = store.search(embeddings[7], top_k=2)
+    # The scaled copy and the original normalize to the same vector
+    assert sorted(_ids(results)) == [7, 7]
+
+
+@pytest.mark.skipif(not _kernels.NUMBA_AVAILABLE, reason="numba not installed")
+def test_int8_kernel_matches_numpy():
+    embeddings, _ = _data()
+    codes, scales = _kernels.encode_int8(_kernels.normalize(embeddings)[0])
+    query = np.random.default_rng(2).normal(size=16).astype(np.float32)
+    mask = np.arange(len(codes)) % 3 == 0
+    
+    for rows in (None, mask):
+        indices, similarity = _kernels.topk_int8(codes, scales, query, rows, 7)
+        expected_indices, expected_similarity = _kernels.topk_int8_numpy(codes, scales, query, rows, 7)
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(similarity, expected_similarity, rtol=1e-5)
+
+
+def _brute_force_ids(store, query, top_k, filters):
+    matching = [i for i, meta in enumerate(store.metadata) if all(meta.get(k) == v for k, v in filters.items())]
+    similarity = store.embeddings[matching] @ (query / np.linalg.norm(query))
+    return [store.metadata[matching[i]]["id"] for i in np.argsort(-similarity)[:top_k]]
+
+
+def test_filter_index_is_updated_by_later_adds():
+    store = _store(n=20)
+    query = _data(20)[0][0]
+    store.search(query, filters={"source": "doc1.txt"})
+    assert "source" in store._filter_index
+    
+    embeddings = np.random.default_rng(5).normal(size=(10, 16)).astype(np.float32)
+    store.add_embeddings(embeddings, [{"id": 100 + i, "source": "doc1.txt" if i % 2 else "new.txt"} for i in range(10)])
+    
+    for source in ("doc1.txt", "new.txt"):
+        filters = {"source": source}
+        assert _ids(store.search(query, top_k=8, filters=filters)) == _brute_force_ids(store, query, 8, filters)
+    assert store._filter_index["source"] == store._build_filter_index("source")
+
+
+def test_filter_on_several_fields():
+    store = LocalVectorStore()
+    embeddings, _ = _data(40)
+    store.add_embeddings(embeddings, [{"id": i, "source": f"doc{i % 4}.txt", "page": i % 5} for i in range(40)])
+    
+    filters = {"source": "doc2.txt", "page": 1}
+    results = store.search(embeddings[6], top_k=10, filters=filters)
+    assert _ids(results) == _brute_force_ids(store, embeddings[6], 10, filters)
+    assert all(r["source"] == "doc2.txt" and r["page"] == 1 for r in results)
+
+
+def test_unhashable_filter_values_fall_back_to_a_scan():
+    store = LocalVectorStore()
+    embeddings, _ = _data(6)
+    store.add_embeddings(embeddings[:3], [{"id": i, "tags": ["a"] if i else "a"} for i in range(3)])
+    
+    assert _ids(store.search(embeddings[1], top_k=5, filters={"tags": ["a"]})) == [1, 2]
+    assert store._filter_index["tags"] is None
+    
+    # Hashable field indexed first, unhashable value added afterwards
+    store.search(embeddings[0], filters={"kind": "x"})
+    store.add_embeddings(embeddings[3:], [{"id": 3 + i, "kind": ["x"] if i else "x"} for i in range(3)])
+    assert store._filter_index["kind"] is None
+    assert _ids(store.search(embeddings[3], top_k=5, filters={"kind": "x"})) == [3]
+    assert _ids(store.search(embeddings[4], top_k=5, filters={"kind": ["x"]})) == [4, 5]
+
+
+def test_filter_without_matches():
+    store = _store(n=20)
+    assert store.search(_data(20)[0][0], filters={"source": "missing.txt"}) == []
+
+
+needs_faiss = pytest.mark.skipif(local.faiss is None, reason="faiss not installed")
+
+
+@pytest.fixture
+def small_index(monkeypatch):
+    """Search the FAISS index of any store, not just large ones"""
+    monkeypatch.setattr(local, "_FAISS_MIN_SIZE", 0)
+
+
+@needs_faiss
+def test_faiss_flat_matches_numpy(small_index):
+    exact = _store()
+    store = _store(backend="faiss_flat")
+    queries = np.random.default_rng(1).normal(size=(10, 16)).astype(np.float32)
+    
+    for query in queries:
+        results = store.search(query, top_k=5)
+        assert _ids(results) == _ids(exact.search(query, top_k=5))
+    assert store._index is not None and store._index.ntotal == 200
+
+
+@needs_faiss
+def test_faiss_hnsw_finds_nearest_neighbors(small_index):
+    exact = _store()
+    store = _store(backend="faiss_hnsw")
+    queries = np.random.default_rng(1).normal(size=(20, 16)).astype(np.float32)
+    
+    found = sum(
+        len(set(_ids(store.search(query, top_k=5))) & set(_ids(exact.search(query, top_k=5))))
+        for query in queries
+    )
+    assert found >= 0.9 * 5 * len(queries)
+
+
+@needs_faiss
+@pytest.mark.parametrize("backend", ["faiss_flat", "faiss_hnsw"])
+def test_faiss_index_covers_later_adds(small_index, backend):
+    store = _store(n=50, backend=backend)
+    store.search(np.ones(16, dtype=np.float32))
+    
+    embeddings = np.random.default_rng(5).normal(size=(5, 16)).astype(np.float32)
+    store.add_embeddings(embeddings, [{"id": 100 + i} for i in range(5)])
+    assert _ids(store.search(embeddings[3], top_k=1)) == [103]
+    assert store._index.ntotal == 55
+
+
+@needs_faiss
+def test_filtered_search_bypasses_the_index(small_index):
+    store = _store(backend="faiss_hnsw")
+    embeddings, _ = _data()
+    
+    results = store.search(embeddings[6], top_k=5, filters={"source": "doc2.txt"})
+    assert results[0]["id"] == 6
+    assert all(result["source"] == "doc2.txt" for result in results)
+    assert store._index is None
+
+
+@needs_faiss
+def test_hnsw_index_is_saved_and_loaded(small_index, tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data()
+    store = LocalVectorStore(store_path=store_path, backend="faiss_hnsw")
+    store.add_embeddings(embeddings[:100], metadata[:100])
+    store.search(embeddings[0])
+    # The index is written with the next save
+    store.add_embeddings(embeddings[100:], metadata[100:])
+    assert (tmp_path / "store.faiss").exists()
+    
+    loaded = LocalVectorStore(store_path=store_path, backend="faiss_hnsw")
+    assert loaded._index is not None
+    assert loaded._index.ntotal == 100
+    assert _ids(loaded.search(embeddings[150], top_k=1)) == [150]
+    assert loaded._index.ntotal == 200
+
+
+@needs_faiss
+def test_flat_index_is_not_saved(small_index, tmp_path):
+    store_path = str(tmp_path / "store")
+    store = LocalVectorStore(store_path=store_path, backend="faiss_flat")
+    store.add_embeddings(*_data())
+    store.search(np.ones(16, dtype=np.float32))
+    store.add_embeddings(*_data(5))
+    
+    assert not (tmp_path / "store.faiss").exists()
+    assert LocalVectorStore(store_path=store_path, backend="faiss_flat")._index is None
+
+
+def test_faiss_backend_without_faiss(monkeypatch):
+    monkeypatch.setattr(local, "faiss", None)
+    store = _store(backend="faiss_hnsw")
+    
+    assert store.backend == "numpy"
+    assert len(store.search(np.ones(16, dtype=np.float32))) == 5
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        LocalVectorStore(backend="annoy")
+
+
+@needs_faiss
+@pytest.mark.parametrize("dim", [16, 15])
+def test_pq4_search_is_reranked_exactly(small_index, dim):
+    exact = _store(n=500, dim=dim)
+    store = _store(n=500, dim=dim, quantize="pq4")
+    queries = np.random.default_rng(1).normal(size=(20, dim)).astype(np.float32)
+    
+    found = 0
+    for query in queries:
+        expected = {r["id"]: r["similarity"] for r in exact.search(query, top_k=500)}
+        results = store.search(query, top_k=5)
+        found += len(set(_ids(results)) & set(_ids(exact.search(query, top_k=5))))
+        # Candidates are rescored against the full vectors
+        for result in results:
+            assert result["similarity"] == pytest.approx(expected[result["id"]], abs=1e-5)
+        assert [r["similarity"] for r in results] == sorted((r["similarity"] for r in results), reverse=True)
+    assert found >= 0.8 * 5 * len(queries)
+    assert isinstance(store._index, local.faiss.IndexPQFastScan)
+
+
+@needs_faiss
+def test_pq4_index_is_saved_and_loaded(small_index, tmp_path):
+    store_path = str(tmp_path / "store")
+    embeddings, metadata = _data(500)
+    store = LocalVectorStore(store_path=store_path, quantize="pq4")
+    store.add_embeddings(embeddings[:400], metadata[:400])
+    store.search(embeddings[0])
+    store.add_embeddings(embeddings[400:], metadata[400:])
+    
+    loaded = LocalVectorStore(store_path=store_path, quantize="pq4")
+    assert isinstance(loaded._index, local.faiss.IndexPQFastScan)
+    assert loaded._index.ntotal == 400
+    assert _ids(loaded.search(embeddings[450], top_k=1)) == [450]
+
+
+@needs_faiss
+def test_mismatched_saved_index_is_rebuilt(small_index, tmp_path):
+    store_path = str(tmp_path / "store")
+    store = LocalVectorStore(store_path=store_path, backend="faiss_hnsw")
+    store.add_embeddings(*_data(500))
+    store.search(np.ones(16, dtype=np.float32))
+    store.add_embeddings(*_data(5))
+    
+    # An HNSW index is not a PQ index
+    loaded = LocalVectorStore(store_path=store_path, quantize="pq4")
+    assert loaded._index is None
+    assert len(loaded.search(np.ones(16, dtype=np.float32))) == 5
+
+
+def test_pq4_without_faiss(monkeypatch):
+    monkeypatch.setattr(local, "faiss", None)
+    store = _store(quantize="pq4")
+    
+    assert store.quantize is None
+    assert len(store.search(np.ones(16, dtype=np.float32))) == 5
+
+
+def test_pq4_with_hnsw_is_rejected():
+    with pytest.raises(ValueError, match="pq4"):
+        LocalVectorStore(quantize="pq4", backend="faiss_hnsw")
+
+
+def _batch_store(kind: str) -> LocalVectorStore:
+    if kind == "int8":
+        return _store(n=500, quantize="int8")
+    if kind in ("faiss_flat", "faiss_hnsw"):
+        return _store(n=500, backend=kind)
+    if kind == "pq4":
+        return _store(n=500, quantize="pq4")
+    return _store(n=500)
+
+
+@pytest.mark.parametrize("kind", [
+    "numpy",
+    "int8",
+    pytest.param("faiss_flat", marks=needs_faiss),
+    pytest.param("faiss_hnsw", marks=needs_faiss),
+    pytest.param("pq4", marks=needs_faiss),
+])
+@pytest.mark.parametrize("filters", [None, {"source": "doc3.txt"}])
+def test_search_batch_matches_search(small_index, kind, filters):
+    store = _batch_store(kind)
+    queries = np.random.default_rng(1).normal(size=(12, 16)).astype(np.float32)
+    
+    batch = store.search_batch(queries, top_k=6, filters=filters)
+    assert len(batch) == len(queries)
+    for query, results in zip(queries, batch):
+        expected = store.search(query, top_k=6, filters=filters)
+        assert _ids(results) == _ids(expected)
+        np.testing.assert_allclose(
+            [r["similarity"] for r in results], [r["similarity"] for r in expected], rtol=1e-4, atol=1e-5
+        )
+
+
+def test_search_batch_in_several_blocks(monkeypatch):
+    # Only a few queries' similarities are computed at a time
+    monkeypatch.setattr(local, "_BATCH_SIMILARITY_SIZE", 1000)
+    store = _store(n=500)
+    queries = np.random.default_rng(1).normal(size=(7, 16)).astype(np.float32)
+    
+    batch = store.search_batch(queries, top_k=3)
+    assert [_ids(results) for results in batch] == [_ids(store.search(query, top_k=3)) for query in queries]
+
+
+def test_search_batch_edge_cases():
+    store = _store(n=20)
+    assert store.search_batch(np.empty((0, 16), dtype=np.float32)) == []
+    assert len(store.search_batch(np.ones(16, dtype=np.float32), top_k=2)) == 1
+    assert store.search_batch(np.ones((2, 16), dtype=np.float32), top_k=0) == [[], []]
+    assert LocalVectorStore().search_batch(np.ones((3, 16), dtype=np.float32)) == [[], [], []]
@@ -0,0 +1,176 @@
+"""
+Tests for generating embeddings with Vertex AI (against a fake model).
+"""
+
+import asyncio
+import threading
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("google.cloud.aiplatform")
+
+from documentor.embedding import vertex
+from documentor.embedding.vertex import VertexEmbeddings
+
+
+class _FakeModel:
+    """Async embedding model that embeds a text as [len(text), 1]"""
+
+    def __init__(self, fail_above=None):
+        self.sizes = []
+        self.fail_above = fail_above
+
+    async def get_embeddings_async(self, texts):
+        self.sizes.append(len(texts))
+        await asyncio.sleep(0.001)
+        if self.fail_above is not None and len(texts) > self.fail_above:
+            raise RuntimeError("batch too large")
+        return [types.SimpleNamespace(values=[float(len(text)), 1.0]) for text in texts]
+
+
+def _embeddings(monkeypatch, model, **kwargs):
+    monkeypatch.setattr(vertex.aiplatform, "init", lambda **kwargs: None)
+    generator = VertexEmbeddings("project", retry_delay=0, **kwargs)
+    generator._model = model
+    return generator
+
+
+def _texts(n):
+    return ["x" * (i % 50) for i in range(n)]
+
+
+def _check(embeddings, texts):
+    assert embeddings.shape == (len(texts), 2)
+    assert embeddings[:, 0].tolist() == [float(len(text)) for text in texts]
+
+
+def test_batch_size_grows_while_latency_improves(monkeypatch):
+    generator = _embeddings(monkeypatch, _FakeModel(), batch_size=4, max_batch_size=10)
+    generator._adapt_batch_size(1.0, 4)
+    assert generator._effective_batch_size <= 4
+    
+    # Falling time per text grows the batch by a quarter, up to max_batch_size
+    generator._adapt_batch_size(0.5, 4)
+    assert generator._effective_batch_size == 5
+    for _ in range(10):
+        generator._adapt_batch_size(0.01, 5)
+    assert generator._effective_batch_size == 10
+    
+    # Rising time per text shrinks it again
+    generator._adapt_batch_size(100.0, 10)
+    assert generator._effective_batch_size == 7
+
+
+def test_batch_size_adapts_within_one_call(monkeypatch):
+    model = _FakeModel()
+    generator = _embeddings(monkeypatch, model, batch_size=2, max_batch_size=50, max_concurrent_requests=2)
+    # Each call takes about the same time, so larger batches lower the time per text
+    texts = _texts(2000)
+    _check(generator.get_embeddings(texts), texts)
+    
+    assert model.sizes[0] == 2
+    assert max(model.sizes) > 2
+    assert sum(model.sizes) == len(texts)
+
+
+def test_failed_grown_batch_is_retried_at_the_configured_size(monkeypatch):
+    model = _FakeModel(fail_above=8)
+    generator = _embeddings(monkeypatch, model, batch_size=4, max_batch_size=16)
+    generator._effective_batch_size = 16
+    texts = _texts(16)
+    
+    _check(generator.get_embeddings(texts), texts)
+    assert model.sizes == [16, 4, 4, 4, 4]
+    assert generator._effective_batch_size <= 4
+
+
+def test_failures_at_the_configured_size_are_raised(monkeypatch):
+    model = _FakeModel(fail_above=0)
+    generator = _embeddings(monkeypatch, model, batch_size=4, max_retries=2)
+    
+    with pytest.raises(RuntimeError, match="batch too large"):
+        generator.get_embeddings(_texts(4))
+    assert model.sizes == [4, 4]
+
+
+class _SyncModel:
+    """Blocking embedding model without an async API"""
+
+    def __init__(self):
+        self.threads = set()
+
+    def get_embeddings(self, texts):
+        self.threads.add(threading.get_ident())
+        return [types.SimpleNamespace(values=[float(len(text)), 1.0]) for text in texts]
+
+
+class _ConcurrencyModel(_FakeModel):
+    """Async model that records how many calls are in flight at once"""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_embeddings_async(self, texts):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await super().get_embeddings_async(texts)
+        finally:
+            self.in_flight -= 1
+
+
+def test_get_embeddings_async_from_another_loop(monkeypatch):
+    generator = _embeddings(monkeypatch, _FakeModel(), batch_size=3)
+    texts = _texts(20)
+    
+    embeddings = asyncio.run(generator.get_embeddings_async(texts))
+    _check(embeddings, texts)
+    # The caller's loop is a different one from the generator's background loop
+    assert generator._loop is not None and not generator._loop.is_closed()
+
+
+def test_concurrent_async_callers(monkeypatch):
+    generator = _embeddings(monkeypatch, _FakeModel(), batch_size=3)
+    batches = [_texts(n) for n in (5, 11, 17)]
+    
+    async def embed_all():
+        return await asyncio.gather(*[generator.get_embeddings_async(texts) for texts in batches])
+    
+    for embeddings, texts in zip(asyncio.run(embed_all()), batches):
+        _check(embeddings, texts)
+
+
+def test_concurrent_requests_are_bounded(monkeypatch):
+    model = _ConcurrencyModel()
+    generator = _embeddings(monkeypatch, model, batch_size=2, max_batch_size=2, max_concurrent_requests=3)
+    texts = _texts(40)
+    
+    _check(generator.get_embeddings(texts), texts)
+    assert 1 < model.max_in_flight <= 3
+
+
+def test_blocking_model_runs_off_the_event_loop(monkeypatch):
+    model = _SyncModel()
+    generator = _embeddings(monkeypatch, model, batch_size=4)
+    texts = _texts(10)
+    
+    _check(generator.get_embeddings(texts), texts)
+    
+    async def current_thread():
+        return threading.get_ident()
+    
+    loop_thread = asyncio.run_coroutine_threadsafe(current_thread(), generator._loop).result()
+    assert model.threads
+    assert loop_thread not in model.threads
+    assert threading.get_ident() not in model.threads
+
+
+def test_empty_input(monkeypatch):
+    generator = _embeddings(monkeypatch, _FakeModel())
+    assert generator.get_embeddings([]).shape[0] == 0
+    assert asyncio.run(generator.get_embeddings_async([])).shape[0] == 0
@@ -0,0 +1,55 @@
+"""
+Tests for the files uploaded to Vertex AI Matching Engine.
+"""
+
+import os
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("google.cloud.aiplatform")
+
+from documentor.storage import vertex
+from documentor.storage.vertex import VertexMatchingEngineStore
+
+_METADATA = [{"id": "a", "source": "doc.txt", "text": "first"}, {"id": "b", "text": "second"}]
+_EXPECTED_RESTRICTS = [[{"namespace": "source", "allow": ["doc.txt"]}], []]
+
+
+def _write(monkeypatch, fastavro):
+    monkeypatch.setattr(vertex, "fastavro", fastavro)
+    # The file writer doesn't use the index, endpoint or clients set up by __init__
+    store = VertexMatchingEngineStore.__new__(VertexMatchingEngineStore)
+    embeddings = np.arange(8, dtype=np.float32).reshape(2, 4)
+    return store._write_embeddings_file(embeddings, _METADATA)
+
+
+def test_jsonl_records(monkeypatch):
+    path = _write(monkeypatch, None)
+    try:
+        assert path.endswith(".jsonl")
+        with open(path, "rb") as f:
+            records = [json.loads(line) for line in f]
+    finally:
+        os.unlink(path)
+    
+    assert [record["id"] for record in records] == ["a", "b"]
+    assert [record["restricts"] for record in records] == _EXPECTED_RESTRICTS
+    assert records[1]["embedding"] == [4.0, 5.0, 6.0, 7.0]
+    assert json.loads(records[0]["metadata"]) == _METADATA[0]
+
+
+def test_avro_records(monkeypatch):
+    fastavro = pytest.importorskip("fastavro")
+    path = _write(monkeypatch, fastavro)
+    try:
+        assert path.endswith(".avro")
+        with open(path, "rb") as f:
+            records = list(fastavro.reader(f))
+    finally:
+        os.unlink(path)
+    
+    assert [record["restricts"] for record in records] == _EXPECTED_RESTRICTS
+    assert records[1]["embedding"] == [4.0, 5.0, 6.0, 7.0]
+    assert json.loads(records[0]["metadata"]) == _METADATA[0]